@@ -47,10 +47,17 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
-    ]
+    ],
+    # Keyset cursor over the view's ordering; clients may ask for ?page_size= up to 100
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetCursorPagination',
+    'PAGE_SIZE': 20,
 }
 
+# Seconds a BookListView page stays cached (writes invalidate it earlier); 0 disables
+API_LIST_CACHE_TIMEOUT = 60
+
 MIDDLEWARE = [
+    'advanced_api_project.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -131,3 +138,19 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Request instrumentation (advanced_api_project/instrumentation.py): Server-Timing on every
+# response, a JSON log line for this fraction of requests, and an HTML panel
+# when DEBUG is on
+INSTRUMENTATION_SAMPLE_RATE = 0.01
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'instrumentation': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
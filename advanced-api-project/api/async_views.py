@@ -0,0 +1,78 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404
+from django.views import View
+from rest_framework.response import Response
+
+from .views import BookDetailView, BookListView
+
+
+class AsyncReadView(View):
+    """
+    Async GET wrapper around a DRF generic view (`view_class`).
+
+    DRF views are synchronous, so the wrapped view's own machinery runs where it
+    must: authentication, permissions, throttles and filter backends (which may
+    validate against the database) in a worker thread, and rendering the same
+    way. The main list/detail query goes through the async ORM, so under ASGI
+    the event loop is free while rows are fetched and while slow clients read.
+
+    The response cache and ETag handling of the sync views are not applied.
+    """
+    view_class = None
+
+    def make_view(self, request, args, kwargs):
+        view = self.view_class()
+        view.args = args
+        view.kwargs = kwargs
+        view.request = view.initialize_request(request, *args, **kwargs)
+        view.headers = view.default_response_headers
+        return view
+
+    async def get(self, request, *args, **kwargs):
+        view = self.make_view(request, args, kwargs)
+        try:
+            await sync_to_async(view.initial)(view.request, *args, **kwargs)
+            response = await self.get_response(view)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+        response = view.finalize_response(view.request, response, *args, **kwargs)
+        return await sync_to_async(response.render)()
+
+    async def get_response(self, view):
+        raise NotImplementedError
+
+
+class AsyncBookListView(AsyncReadView):
+    """
+    Async variant of BookListView: same filters, search, ordering and cursor
+    pagination; the page itself is read with the async ORM.
+    """
+    view_class = BookListView
+
+    async def get_response(self, view):
+        queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+        paginator = view.paginator
+        if paginator is None:
+            books = [book async for book in queryset.aiterator()]
+            return Response(view.get_serializer(books, many=True).data)
+
+        page_queryset = paginator.page_queryset(queryset, view.request, view)
+        books = [book async for book in page_queryset.aiterator()]
+        page = paginator.set_page(books)
+        return paginator.get_paginated_response(view.get_serializer(page, many=True).data)
+
+
+class AsyncBookDetailView(AsyncReadView):
+    """Async variant of BookDetailView, fetched with aget()."""
+    view_class = BookDetailView
+
+    async def get_response(self, view):
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+        try:
+            book = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        await sync_to_async(view.check_object_permissions)(view.request, book)
+        return Response(view.get_serializer(book).data)
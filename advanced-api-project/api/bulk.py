@@ -0,0 +1,154 @@
+import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Author, Book
+from .search import index_books, unindex_books
+from .signals import bulk_write
+
+TITLE_MAX_LENGTH = Book._meta.get_field("title").max_length
+BATCH_SIZE = 1000
+
+
+def existing_pks(model, pks):
+    """Which of `pks` exist, in IN queries of BATCH_SIZE (SQLite caps query parameters)."""
+    pks = list(pks)
+    found = set()
+    for start in range(0, len(pks), BATCH_SIZE):
+        chunk = pks[start:start + BATCH_SIZE]
+        found.update(model.objects.filter(pk__in=chunk).values_list("pk", flat=True))
+    return found
+
+
+def is_pk(value):
+    """JSON integers only: bool is an int subclass, lists and objects are unhashable."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class BookBatch:
+    """
+    Validates a batch of book rows in one pass and writes the valid ones.
+
+    Everything that BookSerializer would look up per row is resolved once for
+    the whole batch: the current year, the referenced authors (one IN query
+    per 1000 ids) and, for updates and deletes, the existing books. Invalid rows are
+    reported as {"index": i, "errors": {field: [messages]}} and skipped.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.errors = []
+        self.current_year = datetime.date.today().year
+
+    def _error(self, index, field, message):
+        self.errors.append({"index": index, "errors": {field: [message]}})
+
+    def _rows_as_dicts(self):
+        for index, row in enumerate(self.rows):
+            if isinstance(row, dict):
+                yield index, row
+            else:
+                self._error(index, "non_field_errors", "Expected an object.")
+
+    def _existing_authors(self, rows):
+        return existing_pks(Author, {row["author"] for _, row in rows if is_pk(row.get("author"))})
+
+    def _clean(self, index, row, author_ids, partial):
+        """Return {field: value} for `row`, or None after recording its errors."""
+        errors = {}
+        cleaned = {}
+        if "title" in row or not partial:
+            title = row.get("title")
+            if not isinstance(title, str) or not title.strip():
+                errors["title"] = ["This field is required."]
+            elif len(title) > TITLE_MAX_LENGTH:
+                errors["title"] = [f"Ensure this field has no more than {TITLE_MAX_LENGTH} characters."]
+            else:
+                cleaned["title"] = title
+        if "publication_year" in row or not partial:
+            year = row.get("publication_year")
+            if not isinstance(year, int) or isinstance(year, bool):
+                errors["publication_year"] = ["A valid integer is required."]
+            elif year > self.current_year:
+                errors["publication_year"] = [
+                    f"Publication year cannot be in the future (>{self.current_year})."
+                ]
+            else:
+                cleaned["publication_year"] = year
+        if "author" in row or not partial:
+            author = row.get("author")
+            if not is_pk(author) or author not in author_ids:
+                errors["author"] = [f'Invalid pk "{author}" - object does not exist.']
+            else:
+                cleaned["author_id"] = author
+        if errors:
+            self.errors.append({"index": index, "errors": errors})
+            return None
+        return cleaned
+
+    @transaction.atomic
+    def create(self):
+        rows = list(self._rows_as_dicts())
+        author_ids = self._existing_authors(rows)
+        books = []
+        for index, row in rows:
+            cleaned = self._clean(index, row, author_ids, partial=False)
+            if cleaned is not None:
+                books.append(Book(**cleaned))
+        with bulk_write():
+            created = Book.objects.bulk_create(books, batch_size=BATCH_SIZE)
+            index_books(book.pk for book in created)
+        return created
+
+    @transaction.atomic
+    def update(self):
+        rows = []
+        for index, row in self._rows_as_dicts():
+            if is_pk(row.get("id")):
+                rows.append((index, row))
+            else:
+                self._error(index, "id", "This field is required.")
+        books = Book.objects.in_bulk([row["id"] for _, row in rows])
+        author_ids = self._existing_authors(rows)
+        changed = []
+        fields = {"updated_at"}
+        now = timezone.now()
+        for index, row in rows:
+            book = books.get(row["id"])
+            if book is None:
+                self._error(index, "id", f'Invalid pk "{row["id"]}" - object does not exist.')
+                continue
+            cleaned = self._clean(index, row, author_ids, partial=True)
+            if cleaned is None:
+                continue
+            for field, value in cleaned.items():
+                setattr(book, field, value)
+            fields.update(cleaned)
+            book.updated_at = now  # bulk_update skips auto_now
+            changed.append(book)
+        with bulk_write():
+            Book.objects.bulk_update(changed, sorted(fields), batch_size=BATCH_SIZE)
+            if fields & {"title", "author_id"}:
+                index_books(book.pk for book in changed)
+        return changed
+
+    @transaction.atomic
+    def delete(self):
+        ids = []
+        for index, row in enumerate(self.rows):
+            book_id = row.get("id") if isinstance(row, dict) else row
+            if is_pk(book_id):
+                ids.append((index, book_id))
+            else:
+                self._error(index, "id", "A valid integer is required.")
+        existing = existing_pks(Book, {book_id for _, book_id in ids})
+        for index, book_id in ids:
+            if book_id not in existing:
+                self._error(index, "id", f'Invalid pk "{book_id}" - object does not exist.')
+        pks = sorted(existing)
+        with bulk_write():
+            for start in range(0, len(pks), BATCH_SIZE):
+                Book.objects.filter(pk__in=pks[start:start + BATCH_SIZE]).delete()
+            unindex_books(pks)
+        return existing
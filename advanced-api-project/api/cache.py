@@ -0,0 +1,114 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .conditional import book_table_version
+
+LIST_KEY = "api:list:{}:{}:{}"
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+
+
+def get_or_compute(key, compute, timeout):
+    """
+    cache.get(key), computing and storing the value on a miss.
+    Stampede guard: only the worker that wins cache.add() on the lock key
+    recomputes; the others poll for its result and only compute themselves
+    if it has not appeared within LOCK_TIMEOUT seconds.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    return compute()
+
+
+def canonical_list_params(view, request):
+    """
+    The query params that shape a list response, normalised so equivalent
+    URLs share a cache entry: unknown params dropped, defaults filled in,
+    search terms collapsed, page_size clamped, and the result sorted.
+    """
+    params = {}
+    for field in getattr(view, "filterset_fields", ()):
+        value = request.query_params.get(field, "").strip()
+        if value:
+            params[field] = value
+
+    if getattr(view, "search_fields", None):
+        terms = request.query_params.get(api_settings.SEARCH_PARAM, "")
+        terms = " ".join(terms.replace(",", " ").lower().split())
+        if terms:
+            params[api_settings.SEARCH_PARAM] = terms
+            for backend in view.filter_backends:
+                fuzzy_param = getattr(backend, "fuzzy_param", None)
+                if fuzzy_param and backend().is_fuzzy(request):
+                    params[fuzzy_param] = True
+
+    ordering = request.query_params.get(api_settings.ORDERING_PARAM, "")
+    ordering = ",".join(term.strip() for term in ordering.split(",") if term.strip())
+    params[api_settings.ORDERING_PARAM] = ordering or ",".join(view.ordering)
+
+    paginator = view.paginator
+    if paginator is not None:
+        params["page_size"] = paginator.get_page_size(request)
+        cursor = request.query_params.get(getattr(paginator, "cursor_query_param", "cursor"))
+        if cursor:
+            params["cursor"] = cursor
+
+    return sorted(params.items())
+
+
+def list_cache_key(view, request):
+    # Scheme and host are part of the key because pagination links are absolute URLs
+    params = canonical_list_params(view, request)
+    digest = hashlib.sha1(f"{request.scheme}://{request.get_host()}|{params}".encode()).hexdigest()
+    version = book_table_version(request).version
+    return LIST_KEY.format(view.cache_prefix, version, digest)
+
+
+class CachedListMixin:
+    """
+    Caches the serialized list payload (response.data) per canonical query.
+    The key includes the book table version, so any Book or Author write makes
+    old entries unreachable. Renderer-independent: the same entry serves the
+    JSON and browsable API renderers.
+    - cache_timeout: TTL in seconds, default settings.API_LIST_CACHE_TIMEOUT;
+      0 disables the cache for the view
+    """
+    cache_prefix = "books"
+    cache_timeout = None
+
+    def get_cache_timeout(self):
+        if self.cache_timeout is not None:
+            return self.cache_timeout
+        return getattr(settings, "API_LIST_CACHE_TIMEOUT", 60)
+
+    def list(self, request, *args, **kwargs):
+        timeout = self.get_cache_timeout()
+        if not timeout:
+            return super().list(request, *args, **kwargs)
+
+        def compute():
+            return super(CachedListMixin, self).list(request, *args, **kwargs).data
+
+        return Response(get_or_compute(list_cache_key(self, request), compute, timeout))
@@ -0,0 +1,59 @@
+import hashlib
+
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from .models import Book, TableVersion
+
+
+def book_table_version(request):
+    # etag_func and last_modified_func both need it: look it up once per request
+    if not hasattr(request, "_book_table_version"):
+        request._book_table_version = TableVersion.current("book")
+    return request._book_table_version
+
+
+def book_list_etag(request, *args, **kwargs):
+    """
+    Strong ETag for a list response: the table version plus everything that
+    changes the representation (query params, negotiated media type).
+    """
+    version = book_table_version(request).version
+    params = sorted((key, sorted(values)) for key, values in request.GET.lists())
+    accept = request.META.get("HTTP_ACCEPT", "")
+    return hashlib.sha1(f"{version}|{params}|{accept}".encode()).hexdigest()
+
+
+def book_list_last_modified(request, *args, **kwargs):
+    return book_table_version(request).changed_at
+
+
+def _book_updated_at(request, pk):
+    if not hasattr(request, "_book_updated_at"):
+        request._book_updated_at = (
+            Book.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+        )
+    return request._book_updated_at
+
+
+def book_detail_etag(request, pk, *args, **kwargs):
+    updated_at = _book_updated_at(request, pk)
+    if updated_at is None:
+        return None  # let the view answer 404
+    accept = request.META.get("HTTP_ACCEPT", "")
+    return hashlib.sha1(f"{pk}|{updated_at.isoformat()}|{accept}".encode()).hexdigest()
+
+
+def book_detail_last_modified(request, pk, *args, **kwargs):
+    return _book_updated_at(request, pk)
+
+
+# Apply to a view's `get`; answers 304 before the view touches its queryset.
+conditional_book_list = method_decorator(
+    condition(etag_func=book_list_etag, last_modified_func=book_list_last_modified),
+    name="get",
+)
+conditional_book_detail = method_decorator(
+    condition(etag_func=book_detail_etag, last_modified_func=book_detail_last_modified),
+    name="get",
+)
@@ -0,0 +1,39 @@
+import csv
+import json
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = ["id", "title", "publication_year", "author", "author__name"]
+EXPORT_HEADER = ["id", "title", "publication_year", "author", "author_name"]
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset):
+    """
+    Yield one tuple per book, reading the table in EXPORT_CHUNK_SIZE chunks.
+    Rows come straight from values_list(), so no model instances are built.
+    """
+    return queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def stream_ndjson(queryset):
+    for row in export_rows(queryset):
+        yield json.dumps(dict(zip(EXPORT_HEADER, row))) + "\n"
+
+
+def stream_csv(queryset):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for row in export_rows(queryset):
+        yield writer.writerow(row)
+
+
+EXPORT_FORMATS = {
+    "ndjson": (stream_ndjson, "application/x-ndjson"),
+    "csv": (stream_csv, "text/csv"),
+}
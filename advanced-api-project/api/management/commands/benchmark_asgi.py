@@ -0,0 +1,135 @@
+import asyncio
+import io
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from api.models import Author, Book
+
+BENCH_AUTHOR = "asgi-benchmark"
+HOST = "localhost"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync book views under a WSGI worker pool with the async views "
+        "under ASGI, with concurrent clients that are slow to read responses. "
+        "Handlers are driven in-process (no sockets); --client-delay models the "
+        "time a slow client keeps the connection busy. Seeds --books committed "
+        "rows and deletes them afterwards. The list response cache is disabled."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=2000)
+        parser.add_argument("--requests", type=int, default=400)
+        parser.add_argument("--concurrency", type=int, default=50, help="simultaneous clients")
+        parser.add_argument("--workers", type=int, default=8, help="WSGI worker threads")
+        parser.add_argument("--client-delay", type=float, default=0.05, help="seconds per response read")
+        parser.add_argument("--path", default="books/?page_size=20", help="path under /api/ and /api/async/")
+
+    def handle(self, *args, **options):
+        self.options = options
+        path, _, query = options["path"].partition("?")
+        author = Author.objects.create(name=BENCH_AUTHOR)
+        try:
+            Book.objects.bulk_create(
+                (Book(title=f"Bench {i}", publication_year=1900 + i % 120, author=author)
+                 for i in range(options["books"])),
+                batch_size=5000,
+            )
+            with override_settings(API_LIST_CACHE_TIMEOUT=0):
+                self.report("wsgi", self.run_wsgi(f"/api/{path}", query))
+                self.report("asgi", asyncio.run(self.run_asgi(f"/api/async/{path}", query)))
+        finally:
+            author.delete()
+
+    def per_client(self):
+        return max(self.options["requests"] // self.options["concurrency"], 1)
+
+    def run_wsgi(self, path, query):
+        # A sync server worker stays blocked until the slow client has read the response
+        handler = WSGIHandler()
+        workers = threading.Semaphore(self.options["workers"])
+        delay = self.options["client_delay"]
+
+        def start_response(status, headers, exc_info=None):
+            if not status.startswith("200"):
+                raise RuntimeError(f"{path}?{query} returned {status}")
+
+        def client():
+            latencies = []
+            for _ in range(self.per_client()):
+                start = time.perf_counter()
+                with workers:
+                    environ = {
+                        "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query,
+                        "SERVER_NAME": HOST, "SERVER_PORT": "80", "HTTP_HOST": HOST,
+                        "wsgi.url_scheme": "http", "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+                    }
+                    b"".join(handler(environ, start_response))
+                    time.sleep(delay)
+                latencies.append(time.perf_counter() - start)
+            return latencies
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(self.options["concurrency"]) as pool:
+            results = [future.result() for future in [pool.submit(client) for _ in range(self.options["concurrency"])]]
+        return time.perf_counter() - start, [latency for result in results for latency in result]
+
+    async def run_asgi(self, path, query):
+        # The event loop serves other requests while a slow client reads
+        handler = ASGIHandler()
+        delay = self.options["client_delay"]
+
+        async def request():
+            received = False
+
+            async def receive():
+                nonlocal received
+                if not received:
+                    received = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await asyncio.Event().wait()
+
+            async def send(message):
+                if message["type"] == "http.response.start" and message["status"] != 200:
+                    raise RuntimeError(f"{path}?{query} returned {message['status']}")
+                if message["type"] == "http.response.body" and not message.get("more_body"):
+                    await asyncio.sleep(delay)
+
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+                "query_string": query.encode(), "root_path": "",
+                "headers": [(b"host", HOST.encode())],
+                "server": (HOST, 80), "client": ("127.0.0.1", 50000),
+            }
+            await handler(scope, receive, send)
+
+        async def client():
+            latencies = []
+            for _ in range(self.per_client()):
+                start = time.perf_counter()
+                await request()
+                latencies.append(time.perf_counter() - start)
+            return latencies
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(client() for _ in range(self.options["concurrency"])))
+        return time.perf_counter() - start, [latency for result in results for latency in result]
+
+    def report(self, label, result):
+        elapsed, latencies = result
+        p50 = statistics.median(latencies)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        self.stdout.write(
+            f"{label}: {len(latencies) / elapsed:8.1f} req/s  "
+            f"p50 {p50 * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms  ({len(latencies)} requests)"
+        )
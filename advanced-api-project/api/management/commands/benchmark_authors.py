@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Author, Book
+from api.serializers import AuthorSerializer, AuthorValuesSerializer, author_rows_with_books
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare author list serialization strategies (naive nested serializer, "
+        "Prefetch + serializer, .values() fast path) on generated data. "
+        "Everything runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--authors", type=int, default=10_000)
+        parser.add_argument("--books", type=int, default=20, help="books per author")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.generate(options["authors"], options["books"])
+            self.run("naive", lambda: AuthorSerializer(Author.objects.order_by("id"), many=True).data)
+            self.run("prefetch", lambda: AuthorSerializer(
+                Author.objects.order_by("id").prefetch_related(
+                    Prefetch("books", queryset=Book.objects.order_by("title", "id"))
+                ),
+                many=True,
+            ).data)
+            self.run("values", lambda: AuthorValuesSerializer(
+                author_rows_with_books(Author.objects.order_by("id").values("id", "name")),
+                many=True,
+            ).data)
+            transaction.set_rollback(True)
+
+    def generate(self, authors, books):
+        self.stdout.write(f"Generating {authors} authors x {books} books...")
+        created = Author.objects.bulk_create(
+            [Author(name=f"Author {i}") for i in range(authors)], batch_size=5000
+        )
+        Book.objects.bulk_create(
+            (
+                Book(title=f"Book {a.pk}-{b}", publication_year=1900 + b, author=a)
+                for a in created for b in range(books)
+            ),
+            batch_size=5000,
+        )
+
+    def run(self, label, serialize):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            data = serialize()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{label:>8}: {elapsed:8.3f}s  {len(ctx.captured_queries):6d} queries  {len(data)} authors"
+        )
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+CREATE_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS api_book_fts
+USING fts5(title, author_name, tokenize = 'trigram')
+"""
+
+POPULATE_SQL = """
+INSERT INTO api_book_fts (rowid, title, author_name)
+SELECT b.id, b.title, a.name
+FROM api_book b
+JOIN api_author a ON a.id = b.author_id
+"""
+
+
+def create_fts_table(apps, schema_editor):
+    # FTS5 is SQLite-only; other databases keep DRF's icontains search.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(CREATE_SQL)
+    schema_editor.execute(POPULATE_SQL)
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS api_book_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_book_updated_at_tableversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 
 class Author(models.Model):
     """
@@ -15,14 +17,51 @@ class Book(models.Model):
     """
     Represents a book with title, publication year,
     and a relationship to its author.
+    updated_at feeds the Last-Modified / ETag headers of the detail endpoint.
     """
     title = models.CharField(max_length=200)
     publication_year = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(
         Author,
         on_delete=models.CASCADE,
         related_name="books"  # allows accessing all books from an author (author.books.all())
     )
 
+    class Meta:
+        indexes = [
+            # BookListView default ordering
+            models.Index(fields=["title"], name="api_book_title_idx"),
+            # ?publication_year= filter and ?ordering=publication_year, then title
+            models.Index(fields=["publication_year", "title"], name="api_book_year_title_idx"),
+            # ?author= filter in title order
+            models.Index(fields=["author", "title"], name="api_book_author_title_idx"),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.publication_year})"
+
+
+class TableVersion(models.Model):
+    """
+    Change counter for a whole table, bumped by signals on every write.
+    List endpoints derive their ETag / Last-Modified from it, so a conditional
+    GET costs one primary-key lookup instead of running the list query.
+    """
+    table = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.table} v{self.version}"
+
+    @classmethod
+    def current(cls, table):
+        obj, _ = cls.objects.get_or_create(table=table)
+        return obj
+
+    @classmethod
+    def bump(cls, table):
+        now = timezone.now()
+        if not cls.objects.filter(table=table).update(version=F("version") + 1, changed_at=now):
+            cls.objects.get_or_create(table=table, defaults={"version": 1, "changed_at": now})
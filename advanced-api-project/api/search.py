@@ -0,0 +1,129 @@
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from .models import Book
+
+FTS_TABLE = "api_book_fts"
+# The trigram tokenizer cannot match anything shorter than one trigram
+MIN_TERM_LENGTH = 3
+BATCH_SIZE = 500
+
+
+def fts_available():
+    return connection.vendor == "sqlite"
+
+
+def _chunks(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+
+def index_books(book_ids):
+    """(Re)write the index rows of `book_ids` from the book and author tables."""
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(book_ids):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", chunk)
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, author_name) "
+                f"SELECT b.id, b.title, a.name FROM api_book b "
+                f"JOIN api_author a ON a.id = b.author_id WHERE b.id IN ({placeholders})",
+                chunk,
+            )
+
+
+def unindex_books(book_ids):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(book_ids):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", chunk)
+
+
+def reindex_author(author):
+    """An author rename rewrites author_name on all of their books' rows."""
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {FTS_TABLE} SET author_name = %s "
+            f"WHERE rowid IN (SELECT id FROM api_book WHERE author_id = %s)",
+            [author.name, author.pk],
+        )
+
+
+def quote(text):
+    return '"{}"'.format(text.replace('"', '""'))
+
+
+def trigrams(term):
+    return {term[i:i + MIN_TERM_LENGTH] for i in range(len(term) - MIN_TERM_LENGTH + 1)}
+
+
+def build_match(terms, fuzzy=False):
+    """
+    FTS5 MATCH expression for `terms`, quoted so user input is never parsed
+    as query syntax.
+    - strict: every term must occur as a substring (so prefixes match too)
+    - fuzzy: any shared trigram matches; rank favours rows sharing the most,
+      which tolerates typos such as "orwel" or "farn"
+    """
+    if fuzzy:
+        grams = sorted(set().union(*(trigrams(term) for term in terms)))
+        return " OR ".join(quote(gram) for gram in grams)
+    return " ".join(quote(term) for term in terms)
+
+
+class BookSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter over a trigram FTS5 index of title and author name.
+
+    Terms of three or more characters are looked up in api_book_fts instead
+    of running icontains over a join; shorter terms fall back to icontains.
+    The index is joined once on rowid = api_book.id, so MATCH runs a single
+    time per query. Every queryset is annotated with `relevance` so clients
+    can ask for ?ordering=relevance; only then is it the FTS5 rank (lower is
+    better), otherwise a constant, so bm25 is not computed for rows that are
+    sorted by something else. ?fuzzy=1 switches to typo-tolerant matching.
+    Databases without FTS5 get DRF's default search.
+    """
+    fuzzy_param = "fuzzy"
+
+    def is_fuzzy(self, request):
+        return request.query_params.get(self.fuzzy_param, "").lower() in ("1", "true", "yes")
+
+    def orders_by_relevance(self, request):
+        fields = request.query_params.get(api_settings.ORDERING_PARAM, "").split(",")
+        return "relevance" in (field.strip().lstrip("-") for field in fields)
+
+    def filter_queryset(self, request, queryset, view):
+        no_rank = Value(0.0, output_field=FloatField())
+        terms = [term.lower() for term in self.get_search_terms(request)]
+        if not terms or not fts_available():
+            queryset = super().filter_queryset(request, queryset, view)
+            return queryset.annotate(relevance=no_rank)
+
+        indexed = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+        for term in terms:
+            if len(term) < MIN_TERM_LENGTH:
+                queryset = queryset.filter(Q(title__icontains=term) | Q(author__name__icontains=term))
+        if not indexed:
+            return queryset.annotate(relevance=no_rank)
+
+        match = build_match(indexed, fuzzy=self.is_fuzzy(request))
+        table = Book._meta.db_table
+        queryset = queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = {table}.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+        )
+        if self.orders_by_relevance(request):
+            return queryset.annotate(relevance=RawSQL(f"{FTS_TABLE}.rank", (), output_field=FloatField()))
+        return queryset.annotate(relevance=no_rank)
@@ -1,9 +1,32 @@
 from rest_framework import serializers
+from advanced_api_project.instrumentation import serializing
 from .models import Author, Book
 import datetime
 
 
-class BookSerializer(serializers.ModelSerializer):
+class TimedListSerializer(serializers.ListSerializer):
+    """ListSerializer whose `.data` is timed like TimedSerializerMixin's."""
+
+    @property
+    def data(self):
+        with serializing():
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Times building `.data` into the request's instrumentation metrics
+    (Server-Timing serialize;dur). many=True lists are timed once, as a whole,
+    by TimedListSerializer, set as the Meta.list_serializer_class.
+    """
+
+    @property
+    def data(self):
+        with serializing():
+            return super().data
+
+
+class BookSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Book model.
     Includes validation to ensure publication_year is not in the future.
@@ -12,6 +35,7 @@ class BookSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ['id', 'title', 'publication_year', 'author']
+        list_serializer_class = TimedListSerializer
 
     def validate_publication_year(self, value):
         """
@@ -25,7 +49,7 @@ class BookSerializer(serializers.ModelSerializer):
         return value
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Author model.
     Includes nested BookSerializer to display all books written by the author.
@@ -35,3 +59,42 @@ class AuthorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Author
         fields = ['id', 'name', 'books']
+        list_serializer_class = TimedListSerializer
+
+
+class AuthorValuesSerializer(TimedSerializerMixin, serializers.BaseSerializer):
+    """
+    Fast read-only variant of AuthorSerializer for listings.
+    Works on plain dict rows (see `author_rows_with_books`) instead of model
+    instances, so no per-instance field objects or nested serializers are built.
+    Output matches AuthorSerializer.
+    """
+
+    class Meta:
+        list_serializer_class = TimedListSerializer
+
+    def to_representation(self, instance):
+        return {
+            "id": instance["id"],
+            "name": instance["name"],
+            "books": instance.get("books", []),
+        }
+
+
+def author_rows_with_books(author_rows):
+    """
+    Attach each author's books to `.values("id", "name")` rows, using a single
+    query for the whole page. Book dicts have BookSerializer's fields.
+    """
+    rows = list(author_rows)
+    by_id = {row["id"]: row for row in rows}
+    for row in rows:
+        row["books"] = []
+    books = (
+        Book.objects.filter(author_id__in=by_id)
+        .order_by("title", "id")
+        .values("id", "title", "publication_year", "author")
+    )
+    for book in books:
+        by_id[book["author"]]["books"].append(book)
+    return rows
@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Author, Book, TableVersion
+from .search import index_books, reindex_author, unindex_books
+
+_bulk_write = ContextVar("bulk_write", default=False)
+
+
+@contextmanager
+def bulk_write():
+    """
+    Collapse the per-row version bumps of a batch write into a single bump.
+    bulk_create/bulk_update send no signals at all, so batch writers must use
+    this (or bump themselves) for ETags to change.
+    """
+    token = _bulk_write.set(True)
+    try:
+        yield
+    finally:
+        _bulk_write.reset(token)
+    TableVersion.bump("book")
+
+
+# Book list responses depend on authors too (search on author__name, author filter)
+
+@receiver([post_save, post_delete], sender=Book)
+@receiver([post_save, post_delete], sender=Author)
+def bump_book_version(sender, **kwargs):
+    if not _bulk_write.get():
+        TableVersion.bump("book")
+
+
+# Search index maintenance (batch writers index their rows themselves)
+
+@receiver(post_save, sender=Book)
+def index_book(sender, instance, **kwargs):
+    if not _bulk_write.get():
+        index_books([instance.pk])
+
+
+@receiver(post_delete, sender=Book)
+def unindex_book(sender, instance, **kwargs):
+    if not _bulk_write.get():
+        unindex_books([instance.pk])
+
+
+@receiver(post_save, sender=Author)
+def reindex_author_books(sender, instance, created, **kwargs):
+    if not created:
+        reindex_author(instance)
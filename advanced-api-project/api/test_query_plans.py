@@ -0,0 +1,87 @@
+import re
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Author, Book
+
+# "SCAN <table>" reads the whole table, and so does "SCAN <table> USING COVERING
+# INDEX i" (the whole index, without visiting the table). "SCAN t USING INDEX i"
+# walks an index in ORDER BY order and stops at the LIMIT; "SEARCH ..."
+# are fine.
+FULL_SCAN_RE = re.compile(r"^SCAN (\w+)(?: USING COVERING INDEX \w+)?$")
+
+
+@override_settings(API_LIST_CACHE_TIMEOUT=0)
+class BookQueryPlanTests(APITestCase):
+    """
+    Runs EXPLAIN QUERY PLAN on every query issued by the Book list and
+    detail endpoints and fails on full table scans.
+    The list response cache is disabled so every request reaches the database.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name="George Orwell")
+        for year in range(1930, 1950):
+            cls.book = Book.objects.create(title=f"Book {year}", publication_year=year, author=cls.author)
+
+    def full_scans(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            details = [row[-1] for row in cursor.fetchall()]
+        return {match.group(1) for match in map(FULL_SCAN_RE.match, details) if match}
+
+    def assertNoFullScans(self, url, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for query in ctx.captured_queries:
+            if not query["sql"].startswith("SELECT"):
+                continue
+            scans = self.full_scans(query["sql"])
+            self.assertFalse(scans, f"full scan of {scans} in: {query['sql']}")
+        return response
+
+    def test_harness_detects_full_scans(self):
+        self.assertEqual(self.full_scans("SELECT * FROM api_author WHERE name = 'x'"), {"api_author"})
+        # reads all of the (author, title) index
+        self.assertEqual(self.full_scans("SELECT author_id FROM api_book WHERE title LIKE '%x%'"), {"api_book"})
+
+    def test_list_default_ordering(self):
+        self.assertNoFullScans(reverse("book-list"))
+
+    def test_list_filtered_and_ordered(self):
+        self.assertNoFullScans(reverse("book-list"), {"publication_year": 1949})
+        self.assertNoFullScans(reverse("book-list"), {"author": self.author.id})
+        self.assertNoFullScans(reverse("book-list"), {"ordering": "-publication_year"})
+
+    def test_list_cursor_pages(self):
+        for ordering in ("title", "-publication_year"):
+            response = self.assertNoFullScans(reverse("book-list"), {"ordering": ordering, "page_size": 5})
+            self.assertNoFullScans(response.data["next"])
+
+    def test_list_search(self):
+        self.assertNoFullScans(reverse("book-list"), {"search": "orwell"})
+        self.assertNoFullScans(reverse("book-list"), {"search": "book 194", "ordering": "relevance"})
+
+    def test_search_matches_once(self):
+        """The index is joined, not probed by a MATCH subquery per book"""
+        params = {"search": "book 19", "ordering": "relevance", "page_size": 5}
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("book-list"), params)
+            self.client.get(response.data["next"])
+        searches = [query for query in ctx.captured_queries if "api_book_fts" in query["sql"]]
+        self.assertEqual(len(searches), 2)
+        for query in searches:
+            self.assertEqual(query["sql"].count("MATCH"), 1, query["sql"])
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                plan = [row[-1] for row in cursor.fetchall()]
+            self.assertFalse([step for step in plan if "SUBQUERY" in step], query["sql"])
+
+    def test_detail(self):
+        self.assertNoFullScans(reverse("book-detail", args=[self.book.id]))
@@ -1,8 +1,23 @@
+import base64
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+
+from advanced_api_project.instrumentation import InstrumentationMiddleware
+from .cache import get_or_compute
 from .models import Author, Book
+from .serializers import AuthorSerializer
 
 
 class BookAPITests(APITestCase):
@@ -12,6 +27,7 @@ class BookAPITests(APITestCase):
     """
 
     def setUp(self):
+        cache.clear()
         # Create test users
         self.admin_user = User.objects.create_user(
             username="admin", password="adminpass", is_staff=True
@@ -93,18 +109,492 @@ class BookAPITests(APITestCase):
         """Test filtering books by publication_year"""
         response = self.client.get(self.list_url, {"publication_year": 1949})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_search_books_by_title(self):
         """Test searching books by title"""
         response = self.client.get(self.list_url, {"search": "1984"})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_order_books_by_year(self):
         """Test ordering books by publication_year"""
         Book.objects.create(title="Animal Farm", publication_year=1945, author=self.author)
         response = self.client.get(self.list_url, {"ordering": "publication_year"})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        years = [book["publication_year"] for book in response.data]
+        years = [book["publication_year"] for book in response.data["results"]]
         self.assertEqual(years, sorted(years))
+
+
+class BookPaginationTests(APITestCase):
+    """
+    Tests for keyset cursor pagination on the book list.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name="George Orwell")
+        # many books share a publication year, so the cursor must break ties
+        for i in range(25):
+            Book.objects.create(title=f"Book {i:02}", publication_year=1940 + i % 3, author=self.author)
+        self.list_url = reverse("book-list")
+
+    def walk(self, params):
+        ids = []
+        response = self.client.get(self.list_url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [book["id"] for book in response.data["results"]]
+            if not response.data["next"]:
+                return ids, response
+            response = self.client.get(response.data["next"])
+
+    def test_walk_every_ordering(self):
+        """Each ordering visits every book once, in order"""
+        for ordering, expected in [
+            ("title", Book.objects.order_by("title", "pk")),
+            ("-publication_year", Book.objects.order_by("-publication_year", "-pk")),
+            ("publication_year,-title", Book.objects.order_by("publication_year", "-title", "pk")),
+        ]:
+            ids, _ = self.walk({"ordering": ordering, "page_size": 4})
+            self.assertEqual(ids, list(expected.values_list("pk", flat=True)), ordering)
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get(self.list_url, {"page_size": 5})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+
+    def test_cursor_is_stable_under_inserts(self):
+        """Books inserted before the cursor position do not shift later pages"""
+        first = self.client.get(self.list_url, {"page_size": 10})
+        Book.objects.create(title="Book 00 bis", publication_year=1940, author=self.author)
+        second = self.client.get(first.data["next"])
+        self.assertEqual(second.data["results"][0]["title"], "Book 10")
+
+    def test_page_size_is_capped(self):
+        for i in range(100):
+            Book.objects.create(title=f"Extra {i}", publication_year=2000, author=self.author)
+        response = self.client.get(self.list_url, {"page_size": 1000})
+        self.assertEqual(len(response.data["results"]), 100)
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get(self.list_url, {"cursor": "cD1ub3Rqc29u"})  # p=notjson
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def cursor(self, position):
+        return base64.b64encode(urlencode({"p": json.dumps(position)}).encode()).decode()
+
+    def test_tampered_cursor_is_404(self):
+        for position in (
+            [None, 1], [[1], [2]], ["x", "y"], {"ordering": ["title", "id"], "values": ["x", "y"]},
+            {"ordering": ["title", "id"], "values": [None, 1]}, {"ordering": ["title", "id"]},
+        ):
+            response = self.client.get(self.list_url, {"cursor": self.cursor(position)})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
+        response = self.client.get(reverse("author-list"), {"cursor": self.cursor(["x"])})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_from_another_ordering_is_404(self):
+        next_url = self.client.get(self.list_url, {"ordering": "title", "page_size": 5}).data["next"]
+        cursor = parse_qs(urlparse(next_url).query)["cursor"][0]
+        response = self.client.get(self.list_url, {"ordering": "publication_year", "cursor": cursor})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AuthorAPITests(APITestCase):
+    """
+    Tests for the author list/detail endpoints and their query counts.
+    """
+
+    def setUp(self):
+        cache.clear()
+        for i in range(5):
+            author = Author.objects.create(name=f"Author {i}")
+            for year in (1950, 1960):
+                Book.objects.create(title=f"Book {i}-{year}", publication_year=year, author=author)
+        self.author = author
+
+    def test_list_matches_model_serializer(self):
+        """The values() fast path returns the same data as AuthorSerializer"""
+        response = self.client.get(reverse("author-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = AuthorSerializer(Author.objects.order_by("id"), many=True).data
+        self.assertEqual(response.data["results"], [dict(author) for author in expected])
+
+    def test_list_query_count_is_constant(self):
+        """Authors page + their books, however many authors there are"""
+        with self.assertNumQueries(2):
+            self.client.get(reverse("author-list"))
+
+    def test_detail_prefetches_books(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("author-detail", args=[self.author.id]))
+        self.assertEqual(len(response.data["books"]), 2)
+
+
+class BookConditionalGetTests(APITestCase):
+    """
+    Tests for ETag / Last-Modified handling on the Book endpoints.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name="George Orwell")
+        self.book = Book.objects.create(title="1984", publication_year=1949, author=self.author)
+        self.list_url = reverse("book-list")
+        self.detail_url = reverse("book-detail", args=[self.book.id])
+
+    def test_list_304_costs_one_query(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_etag_changes_on_write_and_params(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        self.assertNotEqual(self.client.get(self.list_url, {"ordering": "-title"})["ETag"], etag)
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.author)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_list_etag_changes_on_author_write(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        self.author.name = "Eric Blair"
+        self.author.save()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_conditional_get(self):
+        response = self.client.get(self.detail_url)
+        self.assertIn("Last-Modified", response)
+        etag = response["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.book.title = "Nineteen Eighty-Four"
+        self.book.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_book_is_404(self):
+        response = self.client.get(reverse("book-detail", args=[999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BookBulkTests(APITestCase):
+    """
+    Tests for the batch create/update/delete endpoint.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.admin_user = User.objects.create_user(username="admin", password="adminpass", is_staff=True)
+        self.client.force_authenticate(self.admin_user)
+        self.author = Author.objects.create(name="George Orwell")
+        self.url = reverse("book-bulk")
+
+    def test_create_json_array_with_row_errors(self):
+        rows = [
+            {"title": "Animal Farm", "publication_year": 1945, "author": self.author.id},
+            {"title": "", "publication_year": 3000, "author": 999},
+            {"title": "1984", "publication_year": 1949, "author": self.author.id},
+        ]
+        response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertEqual(
+            set(response.data["errors"][0]["errors"]), {"title", "publication_year", "author"}
+        )
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_non_integer_author_is_a_row_error(self):
+        """Lists, objects and booleans are rejected per row, not with a 500"""
+        row = {"title": "Animal Farm", "publication_year": 1945}
+        rows = [{**row, "author": author} for author in ([self.author.id], {"id": self.author.id}, True)]
+        response = self.client.post(self.url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["created"], 0)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [0, 1, 2])
+        self.assertTrue(all(set(error["errors"]) == {"author"} for error in response.data["errors"]))
+
+        book = Book.objects.create(title="1984", publication_year=1949, author=self.author)
+        response = self.client.patch(
+            self.url, [{"id": book.id, "author": [self.author.id]}, {"id": True, "title": "x"}], format="json"
+        )
+        self.assertEqual(response.data["updated"], 0)
+        self.assertEqual(len(response.data["errors"]), 2)
+
+    def test_create_ndjson_in_constant_queries(self):
+        """Query count does not depend on the number of rows"""
+        def body(n):
+            return "\n".join(
+                f'{{"title": "Book {i}", "publication_year": 1950, "author": {self.author.id}}}'
+                for i in range(n)
+            )
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, body(5), content_type="application/x-ndjson")
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(self.url, body(200), content_type="application/x-ndjson")
+        self.assertEqual(response.data["created"], 200)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_update_and_delete(self):
+        books = [
+            Book.objects.create(title=f"Book {i}", publication_year=1950, author=self.author)
+            for i in range(3)
+        ]
+        response = self.client.patch(
+            self.url,
+            [{"id": books[0].id, "title": "Renamed"}, {"id": 999, "title": "Missing"}],
+            format="json",
+        )
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        books[0].refresh_from_db()
+        self.assertEqual(books[0].title, "Renamed")
+
+        response = self.client.delete(self.url, [books[1].id, {"id": books[2].id}], format="json")
+        self.assertEqual(response.data["deleted"], 2)
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_bulk_write_changes_list_etag(self):
+        etag = self.client.get(reverse("book-list"))["ETag"]
+        self.client.post(
+            self.url, [{"title": "New", "publication_year": 1950, "author": self.author.id}], format="json"
+        )
+        self.assertNotEqual(self.client.get(reverse("book-list"))["ETag"], etag)
+
+    def test_requires_staff(self):
+        self.client.force_authenticate(User.objects.create_user(username="user", password="userpass"))
+        response = self.client.post(self.url, [], format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_rejects_non_list_body(self):
+        response = self.client.post(self.url, {"title": "x"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BookExportTests(APITestCase):
+    """
+    Tests for the streaming NDJSON / CSV export.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.huxley = Author.objects.create(name="Aldous Huxley")
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.orwell)
+        Book.objects.create(title="1984", publication_year=1949, author=self.orwell)
+        Book.objects.create(title="Brave New World", publication_year=1932, author=self.huxley)
+
+    def read(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson_export_honors_filters_and_ordering(self):
+        url = reverse("book-export", args=["ndjson"])
+        response = self.client.get(url, {"author": self.orwell.id, "ordering": "-publication_year"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row["title"] for row in rows], ["1984", "Animal Farm"])
+        self.assertEqual(rows[0]["author_name"], "George Orwell")
+
+    def test_csv_export_honors_search(self):
+        response = self.client.get(reverse("book-export", args=["csv"]), {"search": "Huxley"})
+        lines = self.read(response).splitlines()
+        self.assertEqual(lines[0], "id,title,publication_year,author,author_name")
+        self.assertEqual(len(lines), 2)
+        self.assertIn("Brave New World", lines[1])
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse("book-export", args=["xml"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BookListCacheTests(APITestCase):
+    """
+    Tests for the BookListView response cache and its stampede guard.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name="George Orwell")
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.author)
+        self.url = reverse("book-list")
+
+    def test_equivalent_queries_share_an_entry(self):
+        self.client.get(self.url, {"search": "Animal  Farm", "publication_year": "1945"})
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                self.url, {"publication_year": "1945", "search": "animal farm", "ordering": "title"}
+            )
+        # only the table version lookup; no book query
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_scheme_is_part_of_the_key(self):
+        """Absolute pagination links are cached per scheme"""
+        for i in range(3):
+            Book.objects.create(title=f"Book {i}", publication_year=1950, author=self.author)
+        plain = self.client.get(self.url, {"page_size": 2})
+        self.assertTrue(plain.data["next"].startswith("http://"))
+        secure = self.client.get(self.url, {"page_size": 2}, secure=True)
+        self.assertTrue(secure.data["next"].startswith("https://"))
+
+    def test_writes_invalidate(self):
+        self.client.get(self.url)
+        Book.objects.create(title="1984", publication_year=1949, author=self.author)
+        self.assertEqual(len(self.client.get(self.url).data["results"]), 2)
+        self.author.name = "Eric Blair"
+        self.author.save()
+        response = self.client.get(self.url, {"search": "blair"})
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_stampede_guard_computes_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return "value"
+
+        threads = [
+            threading.Thread(target=get_or_compute, args=("stampede-test", compute, 60))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get("stampede-test"), "value")
+
+    @override_settings(API_LIST_CACHE_TIMEOUT=0)
+    def test_timeout_zero_disables_cache(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url)
+        self.assertGreater(len(ctx.captured_queries), 1)
+
+
+class BookSearchTests(APITestCase):
+    """
+    Tests for the trigram FTS search backend and its index maintenance.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.huxley = Author.objects.create(name="Aldous Huxley")
+        self.farm = Book.objects.create(title="Animal Farm", publication_year=1945, author=self.orwell)
+        Book.objects.create(title="1984", publication_year=1949, author=self.orwell)
+        Book.objects.create(title="Brave New World", publication_year=1932, author=self.huxley)
+        self.url = reverse("book-list")
+
+    def titles(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [book["title"] for book in response.data["results"]]
+
+    def test_substring_and_prefix_match(self):
+        self.assertEqual(self.titles({"search": "Orw"}), ["1984", "Animal Farm"])
+        self.assertEqual(self.titles({"search": "nimal"}), ["Animal Farm"])
+        self.assertEqual(self.titles({"search": "orwell farm"}), ["Animal Farm"])
+
+    def test_short_terms_fall_back_to_icontains(self):
+        self.assertEqual(self.titles({"search": "ne"}), ["Brave New World"])
+
+    def test_fuzzy_match_ranked_by_relevance(self):
+        self.assertEqual(self.titles({"search": "Huxly"}), [])
+        self.assertEqual(
+            self.titles({"search": "Huxly", "fuzzy": "1", "ordering": "relevance"})[0],
+            "Brave New World",
+        )
+
+    def test_relevance_pages(self):
+        for year in range(1950, 1955):
+            Book.objects.create(title=f"Orwell Reader {year}", publication_year=year, author=self.orwell)
+        params = {"search": "orwell", "ordering": "relevance", "page_size": 2}
+        response = self.client.get(self.url, params)
+        titles = [book["title"] for book in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            titles += [book["title"] for book in response.data["results"]]
+        self.assertEqual(len(titles), 7)
+        self.assertEqual(set(titles), set(Book.objects.values_list("title", flat=True)) - {"Brave New World"})
+        # "orwell" is in the title too
+        self.assertTrue(titles[0].startswith("Orwell Reader"))
+
+    def test_index_follows_writes(self):
+        self.orwell.name = "Eric Blair"
+        self.orwell.save()
+        self.assertEqual(self.titles({"search": "blair"}), ["1984", "Animal Farm"])
+        self.farm.delete()
+        self.assertEqual(self.titles({"search": "blair"}), ["1984"])
+
+    def test_bulk_writes_are_indexed(self):
+        admin = User.objects.create_user(username="admin", password="adminpass", is_staff=True)
+        self.client.force_authenticate(admin)
+        self.client.post(
+            reverse("book-bulk"),
+            [{"title": "Island", "publication_year": 1962, "author": self.huxley.id}],
+            format="json",
+        )
+        self.assertEqual(self.titles({"search": "island"}), ["Island"])
+
+
+class AsyncBookViewTests(APITestCase):
+    """
+    The async list/detail views return the same payloads as the sync ones.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name="George Orwell")
+        for year in range(1940, 1950):
+            self.book = Book.objects.create(title=f"Book {year}", publication_year=year, author=self.author)
+
+    def test_list_matches_sync_view(self):
+        params = {"ordering": "-publication_year", "page_size": 3, "search": "book"}
+        sync = self.client.get(reverse("book-list"), params).json()
+        response = self.client.get(reverse("async-book-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["results"], sync["results"])
+        following = self.client.get(data["next"]).json()
+        self.assertEqual(following["results"][0]["publication_year"], 1946)
+
+    def test_list_invalid_filter(self):
+        response = self.client.get(reverse("async-book-list"), {"author": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_detail(self):
+        response = self.client.get(reverse("async-book-detail", args=[self.book.id]))
+        self.assertEqual(response.json(), self.client.get(reverse("book-detail", args=[self.book.id])).json())
+        missing = self.client.get(reverse("async-book-detail", args=[999]))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_instrumentation_stays_async(self):
+        """The middleware runs as a coroutine under ASGI and still counts the view's queries"""
+        async def get_response(request):
+            pass
+        self.assertTrue(iscoroutinefunction(InstrumentationMiddleware(get_response)))
+
+        response = async_to_sync(self.async_client.get)(reverse("async-book-detail", args=[self.book.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # the book, run by the ORM in a worker thread
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=1)
+    def test_serialization_is_timed(self):
+        for url in (reverse("book-list"), reverse("async-book-list")):
+            with self.assertLogs("instrumentation") as logs:
+                response = async_to_sync(self.async_client.get)(url)
+            record = json.loads(logs.records[-1].getMessage())
+            self.assertGreater(record["serialize_ms"], 0)
+            self.assertIn(f'serialize;dur={record["serialize_ms"]}', response["Server-Timing"])
@@ -1,16 +1,27 @@
 from django.urls import path
+from .async_views import AsyncBookDetailView, AsyncBookListView
 from .views import (
     BookListView,
     BookDetailView,
     BookCreateView,
     BookUpdateView,
-    BookDeleteView
+    BookDeleteView,
+    BookBulkView,
+    BookExportView,
+    AuthorListView,
+    AuthorDetailView,
 )
 
 urlpatterns = [
     path("books/", BookListView.as_view(), name="book-list"),
     path("books/<int:pk>/", BookDetailView.as_view(), name="book-detail"),
     path("books/create/", BookCreateView.as_view(), name="book-create"),
-    path("books/update/", BookUpdateView.as_view(), name="book-update"),
-    path("books/delete/", BookDeleteView.as_view(), name="book-delete"),
+    path("books/<int:pk>/update/", BookUpdateView.as_view(), name="book-update"),
+    path("books/<int:pk>/delete/", BookDeleteView.as_view(), name="book-delete"),
+    path("books/export/<str:export_format>/", BookExportView.as_view(), name="book-export"),
+    path("books/bulk/", BookBulkView.as_view(), name="book-bulk"),
+    path("async/books/", AsyncBookListView.as_view(), name="async-book-list"),
+    path("async/books/<int:pk>/", AsyncBookDetailView.as_view(), name="async-book-detail"),
+    path("authors/", AuthorListView.as_view(), name="author-list"),
+    path("authors/<int:pk>/", AuthorDetailView.as_view(), name="author-detail"),
 ]
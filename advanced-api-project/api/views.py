@@ -1,32 +1,80 @@
 from rest_framework import generics, filters
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.parsers import JSONParser
+from rest_framework import status
 from django_filters import rest_framework as django_filters
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, IsAuthenticated
-from .models import Book
-from .serializers import BookSerializer
+from django.db.models import Prefetch
+from django.http import Http404, StreamingHttpResponse
+from .models import Author, Book
+from .serializers import AuthorSerializer, AuthorValuesSerializer, BookSerializer, author_rows_with_books
 from .permissions import IsAdminOrReadOnly
+from .conditional import conditional_book_detail, conditional_book_list
+from .bulk import BookBatch
+from .parsers import NDJSONParser
+from .export import EXPORT_FORMATS
+from .cache import CachedListMixin
+from .search import BookSearchFilter
 
 # Generic Views for CRUD on Books
 
-class BookListView(generics.ListAPIView):
+@conditional_book_list
+class BookListView(CachedListMixin, generics.ListAPIView):
+    """
+    ListView: books with filtering, search, ordering and cursor pagination.
+    Sends ETag / Last-Modified from the book table version and answers
+    conditional requests with 304 without running the list query.
+    Pages are cached per canonical query until the next Book/Author write.
+    """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAdminOrReadOnly]
 
     # Add filter, search, and ordering
-    filter_backends = [django_filters.DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [django_filters.DjangoFilterBackend, BookSearchFilter, filters.OrderingFilter]
 
     filterset_fields = ['title', 'author', 'publication_year']
     search_fields = ['title', 'author__name']
-    ordering_fields = ['title', 'publication_year']
+    # relevance: search rank annotated by BookSearchFilter
+    ordering_fields = ['title', 'publication_year', 'relevance']
     ordering = ['title']
 
 
 
+class BookExportView(generics.GenericAPIView):
+    """
+    ExportView: stream every matching book as NDJSON or CSV.
+    Takes the same filter / search / ordering params as BookListView but is not
+    paginated; rows are read with iterator() so memory stays flat.
+    """
+    queryset = Book.objects.all()
+    permission_classes = [IsAdminOrReadOnly]
+    pagination_class = None
+
+    filter_backends = BookListView.filter_backends
+    filterset_fields = BookListView.filterset_fields
+    search_fields = BookListView.search_fields
+    ordering_fields = BookListView.ordering_fields
+    ordering = BookListView.ordering
+
+    def get(self, request, export_format):
+        if export_format not in EXPORT_FORMATS:
+            raise Http404(f"Unknown export format: {export_format}")
+        stream, content_type = EXPORT_FORMATS[export_format]
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(stream(queryset), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="books.{export_format}"'
+        return response
+
+
+@conditional_book_detail
 class BookDetailView(generics.RetrieveAPIView):
     """
     DetailView: Retrieve a single book by ID.
     Read-only for everyone, write restricted by permissions.
+    ETag / Last-Modified come from the book's updated_at.
     """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
@@ -67,3 +115,90 @@ class BookDeleteView(generics.DestroyAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAdminOrReadOnly]
+
+
+class BookBulkView(APIView):
+    """
+    Batch endpoint for catalogue syncs. Accepts a JSON array or NDJSON body.
+    - POST: create books ({"title", "publication_year", "author"} rows)
+    - PATCH: update books ({"id", ...changed fields} rows)
+    - DELETE: delete books (ids, or {"id"} rows)
+    Valid rows are written in one transaction with bulk_create / bulk_update;
+    invalid rows are skipped and returned in "errors" by index.
+    Restricted to staff users.
+    """
+    permission_classes = [IsAdminOrReadOnly]
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def get_batch(self, request):
+        if not isinstance(request.data, list):
+            return None
+        return BookBatch(request.data)
+
+    def respond(self, batch, key, count, success_status):
+        errors = sorted(batch.errors, key=lambda error: error["index"])
+        if not count and errors:
+            success_status = status.HTTP_400_BAD_REQUEST
+        return Response({key: count, "errors": errors}, status=success_status)
+
+    def invalid_body(self):
+        return Response(
+            {"detail": "Expected a JSON array or NDJSON body."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def post(self, request):
+        batch = self.get_batch(request)
+        if batch is None:
+            return self.invalid_body()
+        created = batch.create()
+        return self.respond(batch, "created", len(created), status.HTTP_201_CREATED)
+
+    def patch(self, request):
+        batch = self.get_batch(request)
+        if batch is None:
+            return self.invalid_body()
+        updated = batch.update()
+        return self.respond(batch, "updated", len(updated), status.HTTP_200_OK)
+
+    def delete(self, request):
+        batch = self.get_batch(request)
+        if batch is None:
+            return self.invalid_body()
+        deleted = batch.delete()
+        return self.respond(batch, "deleted", len(deleted), status.HTTP_200_OK)
+
+
+# Read-only views for Authors with their nested books
+
+class AuthorListView(generics.ListAPIView):
+    """
+    ListView: authors with their books.
+    Uses the .values() fast path: one query for the page of authors and one
+    for all of their books, serialized straight from dict rows.
+    """
+    queryset = Author.objects.values("id", "name")
+    serializer_class = AuthorValuesSerializer
+    permission_classes = [IsAdminOrReadOnly]
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['name']
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = author_rows_with_books(page if page is not None else queryset)
+        serializer = self.get_serializer(rows, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+
+class AuthorDetailView(generics.RetrieveAPIView):
+    """
+    DetailView: one author with their books, prefetched in a second query.
+    """
+    queryset = Author.objects.prefetch_related(
+        Prefetch("books", queryset=Book.objects.order_by("title", "id"))
+    )
+    serializer_class = AuthorSerializer
+    permission_classes = [IsAdminOrReadOnly]
@@ -0,0 +1,208 @@
+"""
+Per-request instrumentation: SQL query count and time, duplicate queries
+(N+1 detection), serialization, render and total time.
+
+- every response gets a Server-Timing header
+- a sample of requests (INSTRUMENTATION_SAMPLE_RATE) is logged as one JSON
+  line on the "instrumentation" logger
+- with INSTRUMENTATION_PANEL (defaults to DEBUG) HTML responses get a small
+  summary panel before </body>
+
+Render time covers TemplateResponse rendering (class-based views) and DRF
+renderers, which is where DRF serializes to bytes; templates rendered with
+render() inside a view are part of the view's own time. Serialization time
+is whatever code wraps in `serializing()` (the DRF apps' serializers time
+their `.data`), less the queries run inside it, which count as db time.
+
+The middleware is sync- and async-capable, so under ASGI it does not force
+the stack into a thread. Queries are attributed through a context variable
+read by an execute wrapper installed on every connection: contextvars follow
+sync_to_async into the threads that run the ORM, per-thread connections do
+not.
+"""
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.html import escape
+
+logger = logging.getLogger("instrumentation")
+
+PANEL_DUPLICATES = 5
+
+current_metrics = ContextVar("current_metrics", default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = Counter()
+        self.db_time = 0.0
+        self.render_start = None
+        self.render_time = 0.0
+        self.serialize_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries[sql] += 1
+
+    @property
+    def query_count(self):
+        return sum(self.queries.values())
+
+    @property
+    def duplicates(self):
+        """{sql: times run} for statements run more than once (same SQL, any params)."""
+        return {sql: count for sql, count in self.queries.most_common() if count > 1}
+
+    def as_dict(self, request, response):
+        duplicates = self.duplicates
+        return {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round((time.perf_counter() - self.start) * 1000, 2),
+            "db_ms": round(self.db_time * 1000, 2),
+            "serialize_ms": round(self.serialize_time * 1000, 2),
+            "render_ms": round(self.render_time * 1000, 2),
+            "queries": self.query_count,
+            "duplicate_queries": sum(duplicates.values()) - len(duplicates),
+            "top_duplicates": [
+                {"sql": sql, "count": count}
+                for sql, count in list(duplicates.items())[:PANEL_DUPLICATES]
+            ],
+        }
+
+    def server_timing(self, record):
+        return ", ".join([
+            f'db;dur={record["db_ms"]};desc="{record["queries"]} queries"',
+            f'dup;desc="{record["duplicate_queries"]} duplicate queries"',
+            f'serialize;dur={record["serialize_ms"]}',
+            f'render;dur={record["render_ms"]}',
+            f'total;dur={record["total_ms"]}',
+        ])
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper: times the query into the current request's metrics, if any."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+@contextmanager
+def serializing():
+    """Times the block into the current request's serialize_time, if any."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start, db_time = time.perf_counter(), metrics.db_time
+    try:
+        yield
+    finally:
+        metrics.serialize_time += time.perf_counter() - start - (metrics.db_time - db_time)
+
+
+def install_wrapper(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_wrapper)
+
+
+class InstrumentationMiddleware:
+    """
+    Collects RequestMetrics for every request; see the module docstring.
+    Place it first in MIDDLEWARE so its timings cover the whole stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        # connections opened before this module was imported
+        for connection in connections.all(initialized_only=True):
+            install_wrapper(connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        request.metrics = metrics
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        request.metrics = metrics
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        record = metrics.as_dict(request, response)
+        response["Server-Timing"] = metrics.server_timing(record)
+        if random.random() < getattr(settings, "INSTRUMENTATION_SAMPLE_RATE", 0.0):
+            logger.info(json.dumps(record))
+        if getattr(settings, "INSTRUMENTATION_PANEL", settings.DEBUG):
+            self.add_panel(response, record)
+        return response
+
+    def process_template_response(self, request, response):
+        metrics = request.metrics
+
+        def rendered(response):
+            metrics.render_time += time.perf_counter() - metrics.render_start
+
+        metrics.render_start = time.perf_counter()
+        response.add_post_render_callback(rendered)
+        return response
+
+    def add_panel(self, response, record):
+        if response.streaming or "text/html" not in response.get("Content-Type", ""):
+            return
+        content = response.content.decode(response.charset)
+        if "</body>" not in content:
+            return
+        duplicates = "".join(
+            f"<li>{item['count']}&times; <code>{escape(item['sql'])}</code></li>"
+            for item in record["top_duplicates"]
+        )
+        panel = (
+            '<div id="instrumentation-panel" style="position:fixed;bottom:0;right:0;max-width:40em;'
+            'background:#222;color:#eee;font:12px monospace;padding:6px;z-index:9999">'
+            f'{record["queries"]} queries in {record["db_ms"]} ms, '
+            f'{record["duplicate_queries"]} duplicates, serialize {record["serialize_ms"]} ms, '
+            f'render {record["render_ms"]} ms, '
+            f'total {record["total_ms"]} ms'
+            f"{f'<ul>{duplicates}</ul>' if duplicates else ''}</div>"
+        )
+        response.content = content.replace("</body>", panel + "</body>", 1).encode(response.charset)
+        if response.has_header("Content-Length"):
+            response["Content-Length"] = len(response.content)
@@ -63,6 +63,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'LibraryProject.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -152,3 +153,25 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'bookshelf.CustomUser'
+
+# ModelBackend with a shared permission cache (bookshelf/backends.py)
+AUTHENTICATION_BACKENDS = ['bookshelf.backends.CachedModelBackend']
+
+# Seconds a book search results page is cached (bookshelf/search.py)
+BOOKSHELF_SEARCH_CACHE_TIMEOUT = 60
+
+# Request instrumentation (LibraryProject/instrumentation.py): Server-Timing on every
+# response, a JSON log line for this fraction of requests, and an HTML panel
+# when DEBUG is on
+INSTRUMENTATION_SAMPLE_RATE = 0.01
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'instrumentation': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
@@ -0,0 +1,104 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from bookshelf.models import Author as ShelfAuthor, Book as ShelfBook
+from relationship_app.models import Author, Book, Library
+
+# "SCAN <table>" reads the whole table, and so does "SCAN <table> USING COVERING
+# INDEX i" (the whole index, without visiting the table). "SCAN t USING INDEX i"
+# walks an index in ORDER BY order and stops at the LIMIT; "SEARCH ..."
+# are fine.
+FULL_SCAN_RE = re.compile(r"^SCAN (\w+)(?: USING COVERING INDEX \w+)?$")
+
+
+class QueryPlanTests(TestCase):
+    """
+    Runs EXPLAIN QUERY PLAN on every query issued by the relationship_app and
+    bookshelf views and fails on full table scans, except of the tables a
+    view lists in full by design (`allowed`).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        cls.user.profile.role = "Admin"
+        cls.user.profile.save()
+        cls.library = Library.objects.create(name="Central")
+        author = Author.objects.create(name="George Orwell")
+        shelf_author = ShelfAuthor.objects.create(name="George Orwell")
+        for i in range(15):
+            cls.book = Book.objects.create(title=f"Book {i}", author=author)
+            cls.library.books.add(cls.book)
+            ShelfBook.objects.create(title=f"Book {i}", author=shelf_author)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def full_scans(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            details = [row[-1] for row in cursor.fetchall()]
+        return {match.group(1) for match in map(FULL_SCAN_RE.match, details) if match}
+
+    def assertNoFullScans(self, url_name, *args, params=None, allowed=()):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(url_name, args=args), params or {}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        for query in ctx.captured_queries:
+            if not query["sql"].startswith("SELECT"):
+                continue
+            scans = self.full_scans(query["sql"]) - set(allowed)
+            self.assertFalse(scans, f"full scan of {scans} in: {query['sql']}")
+        return response
+
+    def test_harness_detects_full_scans(self):
+        self.assertEqual(
+            self.full_scans("SELECT * FROM relationship_app_book WHERE publication_year = 1"),
+            {"relationship_app_book"},
+        )
+        # reads all of the (author, title) index
+        self.assertEqual(
+            self.full_scans("SELECT author_id FROM relationship_app_book WHERE title LIKE '%x%'"),
+            {"relationship_app_book"},
+        )
+
+    def test_list_books(self):
+        # the page lists every book
+        self.assertNoFullScans("list_books", allowed={"relationship_app_book"})
+
+    def test_library_detail(self):
+        self.assertNoFullScans("library_detail", self.library.pk)
+
+    def test_role_view(self):
+        self.assertNoFullScans("admin_view")
+
+    def test_book_forms(self):
+        self.assertNoFullScans("add_book")
+        self.assertNoFullScans("edit_book", self.book.pk)
+        self.assertNoFullScans("delete_book", self.book.pk)
+
+    def test_bookshelf_book_list(self):
+        # the page lists every book
+        self.assertNoFullScans("book_list", allowed={"bookshelf_book"})
+
+    def test_bookshelf_search(self):
+        self.assertNoFullScans("search_books", params={"q": "book 1"})
+        self.assertNoFullScans("search_books", params={"q": "george"})
+
+    def test_bookshelf_search_never_sorts(self):
+        """Both search queries read their index in ORDER BY order, so LIMIT bounds the work"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("search_books"), {"q": "g"}, secure=True)
+        self.assertEqual(len(ctx.captured_queries), 2)
+        for query in ctx.captured_queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                plan = [row[-1] for row in cursor.fetchall()]
+            self.assertFalse([step for step in plan if "TEMP B-TREE" in step], query["sql"])
@@ -16,10 +16,11 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from . import views
+from bookshelf import views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("relationship_app/", include("relationship_app.urls")),
     path('books/', views.book_list, name='book_list'),
+    path('books/search/', views.search_books, name='search_books'),
 ]
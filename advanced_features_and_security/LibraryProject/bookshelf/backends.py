@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+VERSION_KEY = "bookshelf:perms:version"
+PERMS_KEY = "bookshelf:perms:{}:{}"
+
+
+def permission_version():
+    """
+    Global permission version, bumped when groups or permissions change.
+    Initialised from the clock so an evicted counter never reuses an old value.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_permission_version():
+    """Invalidate every user's cached permissions."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def forget_permissions(user_ids):
+    """Invalidate the cached permissions of `user_ids` only."""
+    version = permission_version()
+    cache.delete_many([PERMS_KEY.format(user_id, version) for user_id in user_ids])
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose per-user permission set is shared through the cache,
+    keyed by user id and the global permission version, instead of being
+    rebuilt with group/permission joins on every request. Serves
+    permission_required, user.has_perm and the template `perms` variable.
+    Signals in bookshelf.signals do the invalidation.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            key = PERMS_KEY.format(user_obj.pk, permission_version())
+            perms = cache.get(key)
+            if perms is None:
+                perms = super().get_all_permissions(user_obj)
+                cache.set(key, perms, getattr(settings, "PERMISSION_CACHE_TIMEOUT", 3600))
+            user_obj._perm_cache = perms
+        return user_obj._perm_cache
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:19
+
+from django.db import migrations, models
+
+
+def normalize(text):
+    return " ".join(text.casefold().split())
+
+
+def backfill_normalized(apps, schema_editor):
+    Author = apps.get_model('bookshelf', 'Author')
+    Book = apps.get_model('bookshelf', 'Book')
+    authors = list(Author.objects.only('name'))
+    for author in authors:
+        author.name_normalized = normalize(author.name)
+    Author.objects.bulk_update(authors, ['name_normalized'], batch_size=1000)
+    books = list(Book.objects.only('title'))
+    for book in books:
+        book.title_normalized = normalize(book.title)
+    Book.objects.bulk_update(books, ['title_normalized'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookshelf', '0002_alter_book_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='name_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='title_normalized',
+            field=models.CharField(default='', editable=False, max_length=200),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['title_normalized', 'id'], name='bookshelf_book_title_norm_idx'),
+        ),
+        migrations.RunPython(backfill_normalized, migrations.RunPython.noop),
+    ]
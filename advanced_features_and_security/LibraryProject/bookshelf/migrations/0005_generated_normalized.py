@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:08
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    The *_normalized columns become generated columns, so update(),
+    bulk_create() and bulk_update() can no longer leave them stale. A field
+    cannot be altered into a GeneratedField, so they and their indexes are
+    dropped and re-added; the database fills in the values.
+    """
+
+    dependencies = [
+        ('bookshelf', '0004_book_author_norm_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='book',
+            name='bookshelf_book_title_norm_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='book',
+            name='bookshelf_book_author_norm_idx',
+        ),
+        migrations.RemoveField(
+            model_name='book',
+            name='title_normalized',
+        ),
+        migrations.RemoveField(
+            model_name='author',
+            name='name_normalized',
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='title_normalized',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Lower('title'), output_field=models.CharField(max_length=200)),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='name_normalized',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=django.db.models.functions.text.Lower('name'), output_field=models.CharField(max_length=100)),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['title_normalized', 'id'], name='bookshelf_book_title_norm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['author', 'title_normalized', 'id'], name='bookshelf_book_author_norm_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.conf import settings
 from django.db.models.signals import post_save
@@ -7,7 +8,13 @@ from django.dispatch import receiver
 # Create your models here.
 class Book(models.Model):
     title = models.CharField(max_length=200)
-    author = models.ForeignKey('Author', on_delete=models.CASCADE, related_name="books")
+    # lower-cased title, computed by the database so update() and the bulk
+    # methods cannot leave it stale; used for indexed prefix search
+    title_normalized = models.GeneratedField(
+        expression=Lower("title"), output_field=models.CharField(max_length=200), db_persist=True
+    )
+    # indexed by bookshelf_book_author_norm_idx, which leads with author
+    author = models.ForeignKey('Author', on_delete=models.CASCADE, related_name="books", db_index=False)
     publication_year = models.IntegerField(default=2000)
 
     class Meta:
@@ -17,6 +24,11 @@ class Book(models.Model):
             ("can_edit", "Can edit book"),
             ("can_delete", "Can delete book"),
         ]
+        indexes = [
+            models.Index(fields=["title_normalized", "id"], name="bookshelf_book_title_norm_idx"),
+            # an author's books in title order, for the author branch of bookshelf/search.py
+            models.Index(fields=["author", "title_normalized", "id"], name="bookshelf_book_author_norm_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author.name}"
@@ -68,6 +80,10 @@ def create_user_profile(sender, instance, created, **kwargs):
 # -----------------------------
 class Author(models.Model):
     name = models.CharField(max_length=100)
+    # lower-cased name, computed by the database like Book.title_normalized
+    name_normalized = models.GeneratedField(
+        expression=Lower("name"), output_field=models.CharField(max_length=100), db_persist=True, db_index=True
+    )
 
     def __str__(self):
         return self.name
@@ -0,0 +1,95 @@
+import hashlib
+import string
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
+
+from .models import Author, Book
+
+PAGE_SIZE = 20
+# Hard cap: no query can page past this many results
+MAX_RESULTS = 200
+MAX_QUERY_LENGTH = 100
+SEARCH_KEY = "bookshelf:search:{}"
+# Sorts after every character, so [prefix, prefix + HIGHEST) is a prefix range
+HIGHEST = "\U0010ffff"
+# LOWER() folds at least ASCII on every database, so queries that differ
+# only in ASCII case share a cache entry
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def lowered(text):
+    """
+    `text` lower-cased by the database, with the same LOWER() as the
+    *_normalized columns (ASCII-only on SQLite), so both sides always agree.
+    """
+    return Lower(Value(text))
+
+
+def prefix_range(field, prefix):
+    """
+    `field` starts with `prefix`, written as a range so SQLite can seek the
+    index (LIKE 'x%' with ESCAPE cannot use it).
+    """
+    return Q(**{f"{field}__gte": lowered(prefix), f"{field}__lt": lowered(prefix + HIGHEST)})
+
+
+def search_books(query, page=1):
+    """
+    Books whose title or author name starts with `query` (case-insensitive,
+    runs of whitespace in `query` count as one space):
+    title matches in title order, then the other books of matching authors
+    by author and title. Returns {"results": [{"title", "author"}], "page",
+    "has_previous", "has_next"}; at most MAX_RESULTS are found.
+    The result list of a query is cached (settings.BOOKSHELF_SEARCH_CACHE_TIMEOUT
+    seconds) and shared by all its pages.
+    """
+    prefix = " ".join(query[:MAX_QUERY_LENGTH].split())
+    if not prefix:
+        return {"results": [], "page": 1, "has_previous": False, "has_next": False}
+
+    key = SEARCH_KEY.format(hashlib.sha1(prefix.translate(ASCII_LOWER).encode()).hexdigest())
+    results = cache.get(key)
+    if results is None:
+        results = _search(prefix)
+        cache.set(key, results, getattr(settings, "BOOKSHELF_SEARCH_CACHE_TIMEOUT", 60))
+
+    last_page = max(1, -(-len(results) // PAGE_SIZE))
+    page = min(max(page, 1), last_page)
+    offset = (page - 1) * PAGE_SIZE
+    return {
+        "results": results[offset:offset + PAGE_SIZE],
+        "page": page,
+        "has_previous": page > 1,
+        "has_next": page < last_page,
+    }
+
+
+def _search(prefix):
+    """
+    At most MAX_RESULTS matches. Each query walks an index in its ORDER BY
+    order and stops at its LIMIT, so the work is bounded however many rows
+    match a short prefix: no query sorts its matches.
+    """
+    title_match = prefix_range("title_normalized", prefix)
+    rows = list(
+        Book.objects.filter(title_match)
+        .order_by("title_normalized", "id")
+        .values_list("title", "author__name")[:MAX_RESULTS]
+    )
+    if len(rows) < MAX_RESULTS:
+        # Authors in name order, each one's books through the
+        # (author, title_normalized, id) index. Queried from Author so the
+        # tie-break is the author's own id, which SQLite knows its index yields.
+        rows += (
+            Author.objects.filter(
+                prefix_range("name_normalized", prefix),
+                Q(books__title_normalized__lt=lowered(prefix))
+                | Q(books__title_normalized__gte=lowered(prefix + HIGHEST)),
+            )
+            .order_by("name_normalized", "id", "books__title_normalized", "books__id")
+            .values_list("books__title", "name")[:MAX_RESULTS - len(rows)]
+        )
+    return [{"title": title, "author": author} for title, author in rows]
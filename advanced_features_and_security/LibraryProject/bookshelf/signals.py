@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import bump_permission_version, forget_permissions
+
+User = get_user_model()
+
+
+# Permission cache invalidation
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def user_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        # user.groups.* / user.user_permissions.*: only this user changed
+        forget_permissions([instance.pk])
+    elif pk_set is not None:
+        # group.user_set.* / permission.user_set.*: pk_set holds the users
+        forget_permissions(pk_set)
+    else:
+        bump_permission_version()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_permission_version()
+
+
+@receiver([post_save, post_delete], sender=Group)
+@receiver(post_delete, sender=Permission)
+def group_or_permission_changed(sender, **kwargs):
+    bump_permission_version()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    # is_active / is_superuser changes
+    if not created:
+        forget_permissions([instance.pk])
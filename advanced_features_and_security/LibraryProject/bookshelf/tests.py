@@ -1,3 +1,119 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from . import search
+from .models import Author, Book
+
+
+class PermissionCacheTests(TestCase):
+    """
+    permission_required views and template perms read the cached permission
+    set; group and permission changes invalidate it.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("alice", "alice@example.com", "pass")
+        self.group = Group.objects.create(name="Viewers")
+        self.group.permissions.add(Permission.objects.get(codename="can_view"))
+        self.user.groups.add(self.group)
+        Book.objects.create(title="Animal Farm", author=Author.objects.create(name="George Orwell"))
+        self.client.force_login(self.user)
+        self.url = reverse("book_list")
+
+    def test_permissions_are_cached(self):
+        self.assertEqual(self.client.get(self.url, secure=True).status_code, 200)
+        # session, user and the book list: no permission queries
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, secure=True)
+        self.assertContains(response, "Animal Farm")
+
+    def test_group_permission_change_invalidates(self):
+        self.client.get(self.url, secure=True)
+        self.group.permissions.clear()
+        self.assertEqual(self.client.get(self.url, secure=True).status_code, 403)
+
+    def test_group_membership_change_invalidates(self):
+        self.client.get(self.url, secure=True)
+        self.group.user_set.remove(self.user)
+        self.assertEqual(self.client.get(self.url, secure=True).status_code, 403)
+        self.user.groups.add(self.group)
+        self.assertEqual(self.client.get(self.url, secure=True).status_code, 200)
+
+    def test_template_perms_use_the_cache(self):
+        self.user.user_permissions.add(Permission.objects.get(codename="can_add_book"))
+        response = self.client.get(reverse("list_books"), secure=True)
+        self.assertContains(response, reverse("add_book"))
+        self.user.user_permissions.clear()
+        response = self.client.get(reverse("list_books"), secure=True)
+        self.assertNotContains(response, reverse("add_book"))
+
+
+class SearchTests(TestCase):
+    """Prefix search on normalized title and author name, capped, paged and cached."""
+
+    def setUp(self):
+        cache.clear()
+        self.orwell = Author.objects.create(name="George Orwell")
+        Book.objects.create(title="Animal Farm", author=self.orwell)
+        Book.objects.create(title="Nineteen Eighty-Four", author=self.orwell)
+        Book.objects.create(title="Brave New World", author=Author.objects.create(name="Aldous Huxley"))
+        self.url = reverse("search_books")
+
+    def titles(self, query, page=1):
+        return [book["title"] for book in search.search_books(query, page)["results"]]
+
+    def test_normalized_fields_follow_every_write(self):
+        self.assertEqual(self.orwell.name_normalized, "george orwell")
+        book = Book.objects.get(title="Animal Farm")
+        book.title = "ANIMAL Farm"
+        book.save(update_fields=["title"])
+        book.refresh_from_db()
+        self.assertEqual(book.title_normalized, "animal farm")
+        Book.objects.filter(pk=book.pk).update(title="Animal FARM")
+        book.refresh_from_db()
+        self.assertEqual(book.title_normalized, "animal farm")
+        book.title = "Farm, Animal"
+        Book.objects.bulk_update([book], ["title"])
+        Author.objects.bulk_create([Author(name="ERIC Blair")])
+        self.assertEqual(self.titles("farm, an"), ["Farm, Animal"])
+        self.assertEqual(Author.objects.get(name="ERIC Blair").name_normalized, "eric blair")
+
+    def test_prefix_of_title_or_author(self):
+        self.assertEqual(self.titles("ANIMAL"), ["Animal Farm"])
+        self.assertEqual(self.titles("george orw"), ["Animal Farm", "Nineteen Eighty-Four"])
+        self.assertEqual(self.titles("farm"), [])
+        # title matches first, then the other books of matching authors
+        Book.objects.create(title="Aldous and Me", author=self.orwell)
+        self.assertEqual(self.titles("ald"), ["Aldous and Me", "Brave New World"])
+        self.assertEqual(self.titles("   "), [])
+        self.assertEqual(self.titles("  animal   f"), ["Animal Farm"])
+
+    def test_cached_once_for_all_pages(self):
+        # title matches, then author matches
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"q": "brave"}, secure=True)
+        self.assertContains(response, "Brave New World by Aldous Huxley")
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {"q": "Brave", "page": 2}, secure=True)
+
+    def test_results_are_capped(self):
+        Book.objects.bulk_create(
+            Book(title=f"Capped {i:03}", author=self.orwell)
+            for i in range(search.MAX_RESULTS + 10)
+        )
+        last_page = search.MAX_RESULTS // search.PAGE_SIZE
+        # a full title branch skips the author query
+        with self.assertNumQueries(1):
+            first = search.search_books("capped")
+        self.assertEqual(len(first["results"]), search.PAGE_SIZE)
+        self.assertTrue(first["has_next"])
+        beyond = search.search_books("capped", last_page + 5)
+        self.assertEqual(beyond["page"], last_page)
+        self.assertFalse(beyond["has_next"])
+        self.assertEqual(beyond["results"][-1]["title"], f"Capped {search.MAX_RESULTS - 1:03}")
+        response = self.client.get(self.url, {"q": "capped", "page": "x"}, secure=True)
+        self.assertContains(response, "Capped 000")
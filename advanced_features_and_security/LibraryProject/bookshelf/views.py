@@ -2,24 +2,24 @@ from django.shortcuts import render, redirect
 from .forms import ExampleForm
 from django.contrib.auth.decorators import permission_required
 from .models import Book
-from django.db.models import Q
+from . import search
 
 
 # View for listing books (requires can_view permission)
 @permission_required('bookshelf.can_view', raise_exception=True)
 def book_list(request):
-    books = Book.objects.all()
+    books = Book.objects.select_related("author")
     return render(request, 'bookshelf/book_list.html', {'books': books})
 
 def search_books(request):
+    # Indexed prefix search, capped and paged (see bookshelf/search.py)
     query = request.GET.get("q", "")
-    books = []
-    if query:
-        # ✅ Safe: ORM query prevents SQL injection
-        books = Book.objects.filter(
-            Q(title__icontains=query) | Q(author__name__icontains=query)
-        )
-    return render(request, "bookshelf/book_list.html", {"books": books})
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        page = 1
+    found = search.search_books(query, page)
+    return render(request, "bookshelf/search_results.html", {"query": query, **found})
 
 def example_form_view(request):
     if request.method == "POST":
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from relationship_app.membership import Membership, add_books, remove_books, sync_books
+from relationship_app.models import Author, Book, Library
+
+
+class Command(BaseCommand):
+    help = (
+        "Time bulk Library.books operations against one-at-a-time library.books.add() "
+        "on generated data (default 10 libraries x 100k books = 1M memberships). "
+        "Everything runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--libraries", type=int, default=10)
+        parser.add_argument("--books", type=int, default=100_000)
+        parser.add_argument("--naive-sample", type=int, default=2000, help="books added one at a time")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            libraries, book_ids = self.generate(options["libraries"], options["books"])
+
+            sample = book_ids[:options["naive_sample"]]
+            elapsed = self.timed(lambda: [libraries[0].books.add(book_id) for book_id in sample])
+            self.report("naive add", elapsed, len(sample))
+            remove_books(libraries[0], sample)
+
+            elapsed = self.timed(lambda: [add_books(library, book_ids) for library in libraries])
+            self.report("bulk add", elapsed, len(libraries) * len(book_ids))
+
+            elapsed = self.timed(lambda: add_books(libraries[0], book_ids))
+            self.report("re-add (all conflicts)", elapsed, len(book_ids))
+
+            # replace a tenth of one library's catalogue
+            tenth = len(book_ids) // 10
+            wanted = book_ids[tenth:] + book_ids[:tenth][::2]
+            elapsed = self.timed(lambda: sync_books(libraries[0], wanted))
+            self.report("sync 10% change", elapsed, len(book_ids))
+
+            elapsed = self.timed(lambda: remove_books(libraries[1], book_ids))
+            self.report("bulk remove", elapsed, len(book_ids))
+
+            self.stdout.write(f"memberships at end: {Membership.objects.count()}")
+            transaction.set_rollback(True)
+
+    def generate(self, libraries, books):
+        self.stdout.write(f"Generating {books} books and {libraries} libraries...")
+        author = Author.objects.create(name="Benchmark Author")
+        Book.objects.bulk_create(
+            (Book(title=f"Book {i}", author=author) for i in range(books)), batch_size=5000
+        )
+        book_ids = list(Book.objects.filter(author=author).order_by("pk").values_list("pk", flat=True))
+        created = Library.objects.bulk_create(Library(name=f"Branch {i}") for i in range(libraries))
+        return created, book_ids
+
+    def timed(self, func):
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    def report(self, label, elapsed, rows):
+        self.stdout.write(f"{label:>24}: {elapsed:8.2f}s  {rows / elapsed:12,.0f} rows/s  ({rows} rows)")
@@ -0,0 +1,84 @@
+import datetime
+import json
+import sqlite3
+import time
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from relationship_app import query_samples
+
+
+class QueryCounter:
+    """connection.execute_wrapper hook; unlike CaptureQueriesContext it has no 9000-query cap."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the query patterns in relationship_app.query_samples, naive and "
+        "optimized, on generated data at each --scale (number of books) and "
+        "write the timings and query counts as JSON. Runs in a transaction that "
+        "is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, nargs="+", default=[1000, 10_000, 100_000])
+        parser.add_argument("--repeat", type=int, default=5, help="runs per pattern; the best is kept")
+        parser.add_argument("--output", help="JSON file to write (default: stdout)")
+
+    def handle(self, *args, **options):
+        report = {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "sqlite": sqlite3.sqlite_version if connection.vendor == "sqlite" else None,
+            "repeat": options["repeat"],
+            "results": [],
+        }
+        for scale in options["scale"]:
+            self.stderr.write(f"Generating {scale} books...")
+            with transaction.atomic():
+                arguments = query_samples.generate(scale)
+                for name, variants in query_samples.PATTERNS.items():
+                    for variant, func in zip(("naive", "optimized"), variants):
+                        report["results"].append(
+                            self.measure(scale, name, variant, func, arguments[name], options["repeat"])
+                        )
+                transaction.set_rollback(True)
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+            self.stderr.write(f"Wrote {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def measure(self, scale, name, variant, func, args, repeat):
+        timings = []
+        for _ in range(repeat):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                rows = func(*args)
+                timings.append(time.perf_counter() - start)
+        result = {
+            "scale": scale,
+            "pattern": name,
+            "variant": variant,
+            "seconds": round(min(timings), 6),
+            "queries": counter.count,
+            "rows": len(rows) if isinstance(rows, list) else 1,
+        }
+        self.stderr.write(
+            f"{scale:>9} {name:>22} {variant:>9}: {result['seconds'] * 1000:9.2f} ms  {result['queries']:5d} queries"
+        )
+        return result
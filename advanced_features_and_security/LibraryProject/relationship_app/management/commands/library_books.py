@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from relationship_app.membership import add_books, read_book_ids, remove_books, sync_books
+from relationship_app.models import Library
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-manage a library's catalogue from a CSV with a 'book_id' or 'title' "
+        "column: add the listed books, remove them, or sync the library to exactly that list."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("library", help="library id or name")
+        parser.add_argument("action", choices=["add", "remove", "sync"])
+        parser.add_argument("csv_file")
+
+    def handle(self, *args, **options):
+        library = self.get_library(options["library"])
+        with open(options["csv_file"], newline="", encoding="utf-8") as csv_file:
+            try:
+                book_ids, unknown = read_book_ids(csv_file)
+            except ValueError as exc:
+                raise CommandError(exc)
+
+        if options["action"] == "add":
+            self.stdout.write(f"Added up to {add_books(library, book_ids)} books to {library}.")
+        elif options["action"] == "remove":
+            self.stdout.write(f"Removed {remove_books(library, book_ids)} books from {library}.")
+        else:
+            added, removed = sync_books(library, book_ids)
+            self.stdout.write(f"Synced {library}: {added} added, {removed} removed.")
+        if unknown:
+            self.stderr.write(f"{len(unknown)} rows did not match a book, e.g. {unknown[:5]}")
+
+    def get_library(self, value):
+        lookup = {"pk": int(value)} if value.isdigit() else {"name": value}
+        try:
+            return Library.objects.get(**lookup)
+        except Library.DoesNotExist:
+            raise CommandError(f"No library {value!r}")
@@ -0,0 +1,93 @@
+"""
+Bulk Library.books membership operations.
+
+Rows are written straight to the auto-created through table
+(relationship_app_library_books), whose unique (library_id, book_id)
+constraint makes inserts idempotent with ignore_conflicts and indexes both
+lookup directions. m2m_changed is not sent for these writes.
+"""
+import csv
+from itertools import islice
+
+from django.db import transaction
+
+from .models import Book, Library
+
+CHUNK_SIZE = 5000
+Membership = Library.books.through
+
+
+def chunked(iterable):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, CHUNK_SIZE)):
+        yield chunk
+
+
+@transaction.atomic
+def add_books(library, book_ids):
+    """Add `book_ids` to the library; ids already present are skipped by the database."""
+    requested = 0
+    for chunk in chunked(book_ids):
+        Membership.objects.bulk_create(
+            [Membership(library_id=library.pk, book_id=book_id) for book_id in chunk],
+            ignore_conflicts=True,
+        )
+        requested += len(chunk)
+    return requested
+
+
+@transaction.atomic
+def remove_books(library, book_ids):
+    """Remove `book_ids` from the library; returns the number of rows deleted."""
+    removed = 0
+    for chunk in chunked(book_ids):
+        removed += Membership.objects.filter(library_id=library.pk, book_id__in=chunk).delete()[0]
+    return removed
+
+
+@transaction.atomic
+def sync_books(library, book_ids):
+    """
+    Make the library hold exactly `book_ids`, touching only the difference.
+    Returns (added, removed) counts.
+    """
+    wanted = set(book_ids)
+    current = set(
+        Membership.objects.filter(library_id=library.pk).values_list("book_id", flat=True).iterator()
+    )
+    to_add = sorted(wanted - current)
+    to_remove = sorted(current - wanted)
+    add_books(library, to_add)
+    remove_books(library, to_remove)
+    return len(to_add), len(to_remove)
+
+
+def read_book_ids(csv_file):
+    """
+    Book ids from a CSV with a `book_id` or a `title` column.
+    Titles are resolved in chunks through the title index; returns
+    (ids, unknown) where `unknown` lists the book ids or titles not found.
+    """
+    reader = csv.DictReader(csv_file)
+    if "book_id" in (reader.fieldnames or ()):
+        values = [int(row["book_id"]) for row in reader if row["book_id"].strip()]
+        ids, unknown = [], []
+        for chunk in chunked(values):
+            found = set(Book.objects.filter(pk__in=chunk).values_list("pk", flat=True))
+            ids.extend(book_id for book_id in chunk if book_id in found)
+            unknown.extend(book_id for book_id in chunk if book_id not in found)
+        return ids, unknown
+    if "title" in (reader.fieldnames or ()):
+        titles = [row["title"].strip() for row in reader if row["title"].strip()]
+        ids, unknown = [], []
+        for chunk in chunked(titles):
+            found = {}
+            for title, book_id in Book.objects.filter(title__in=chunk).values_list("title", "pk"):
+                found.setdefault(title, []).append(book_id)
+            for title in chunk:
+                if title in found:
+                    ids.extend(found[title])
+                else:
+                    unknown.append(title)
+        return ids, unknown
+    raise ValueError("CSV needs a 'book_id' or 'title' column")
@@ -9,18 +9,39 @@ class Author(models.Model):
     def __str__(self):
         return self.name
 
+class BookQuerySet(models.QuerySet):
+    def with_authors(self):
+        """Join the author so book.author.name costs no extra query."""
+        return self.select_related("author")
+
+
+class LibraryQuerySet(models.QuerySet):
+    def with_books_and_authors(self):
+        """Load each library's books (and their authors) in one extra query."""
+        return self.prefetch_related(
+            models.Prefetch("books", queryset=Book.objects.with_authors().order_by("title"))
+        )
+
+
 # Book model
 class Book(models.Model):
     title = models.CharField(max_length=200)
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name="books")
     publication_year = models.IntegerField(default=2000)
 
+    objects = BookQuerySet.as_manager()
+
     class Meta:
         permissions = [
             ("can_add_book", "Can add book"),
             ("can_change_book", "Can change book"),
             ("can_delete_book", "Can delete book"),
         ]
+        indexes = [
+            models.Index(fields=["title"], name="rel_book_title_idx"),
+            # books of one author by title
+            models.Index(fields=["author", "title"], name="rel_book_author_title_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author.name}"
@@ -30,6 +51,8 @@ class Library(models.Model):
     name = models.CharField(max_length=100)
     books = models.ManyToManyField(Book, related_name="libraries")
 
+    objects = LibraryQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
@@ -1,20 +1,124 @@
+"""
+Query patterns over the relationship_app models, each in a naive form and an
+optimized form that returns the same data. Used by the benchmark_queries
+command; `generate` builds fixture data at a given scale.
+
+Every function returns fully evaluated results so timings include fetching.
+"""
+from django.db.models import Max, Prefetch
+
 from relationship_app.models import Author, Book, Library, Librarian
 
+BOOKS_PER_AUTHOR = 10
+BOOKS_PER_LIBRARY = 1000
+CATALOGUE_LIBRARIES = 20
+BATCH_SIZE = 5000
+
+
 # 1. Query all books by a specific author
-author_name = "George Orwell"
-author = Author.objects.get(name=author_name)
-books_by_author = Book.objects.filter(author=author)
-print(f"Books by {author_name}:")
-for book in books_by_author:
-    print(book.title)
-
-# 2. List all books in a library
-library_name = "Central Library"
-library = Library.objects.get(name=library_name)
-print(f"\nBooks in {library_name}:")
-for book in library.books.all():
-    print(book.title)
+
+def books_by_author_naive(author_name):
+    author = Author.objects.get(name=author_name)
+    return [book.title for book in Book.objects.filter(author=author)]
+
+
+def books_by_author_optimized(author_name):
+    return list(Book.objects.filter(author__name=author_name).values_list("title", flat=True))
+
+
+# 2. List all books in a library, with their authors
+
+def books_in_library_naive(library_name):
+    library = Library.objects.get(name=library_name)
+    return [(book.title, book.author.name) for book in library.books.all()]
+
+
+def books_in_library_optimized(library_name):
+    return list(
+        Book.objects.filter(libraries__name=library_name).values_list("title", "author__name")
+    )
+
 
 # 3. Retrieve the librarian for a library
-librarian = Librarian.objects.get(library=library)
-print(f"\nLibrarian of {library_name}: {librarian.name}")
+
+def librarian_for_library_naive(library_name):
+    library = Library.objects.get(name=library_name)
+    return Librarian.objects.get(library=library).name
+
+
+def librarian_for_library_optimized(library_name):
+    return Librarian.objects.filter(library__name=library_name).values_list("name", flat=True).get()
+
+
+# 4. Catalogue page: the first libraries with all their books and authors
+
+def catalogue_naive():
+    return [
+        (library.name, [(book.title, book.author.name) for book in library.books.all()])
+        for library in Library.objects.order_by("pk")[:CATALOGUE_LIBRARIES]
+    ]
+
+
+def catalogue_optimized():
+    libraries = Library.objects.order_by("pk").prefetch_related(
+        Prefetch("books", queryset=Book.objects.with_authors())
+    )[:CATALOGUE_LIBRARIES]
+    return [
+        (library.name, [(book.title, book.author.name) for book in library.books.all()])
+        for library in libraries
+    ]
+
+
+PATTERNS = {
+    "books_by_author": (books_by_author_naive, books_by_author_optimized),
+    "books_in_library": (books_in_library_naive, books_in_library_optimized),
+    "librarian_for_library": (librarian_for_library_naive, librarian_for_library_optimized),
+    "catalogue": (catalogue_naive, catalogue_optimized),
+}
+
+
+def generate(books):
+    """
+    Fixture data for `books` books: one author per BOOKS_PER_AUTHOR books and
+    one library (with a librarian) per BOOKS_PER_LIBRARY books, each book held
+    by one library. Names are prefixed so they cannot collide with existing
+    rows. Returns the arguments the patterns are run with.
+    """
+    last_book = Book.objects.aggregate(last=Max("pk"))["last"] or 0
+    authors = Author.objects.bulk_create(
+        (Author(name=f"Bench Author {i}") for i in range(max(books // BOOKS_PER_AUTHOR, 1))),
+        batch_size=BATCH_SIZE,
+    )
+    author_ids = [author.pk for author in authors]
+    Book.objects.bulk_create(
+        (
+            Book(title=f"Bench Book {i}", author_id=author_ids[i // BOOKS_PER_AUTHOR % len(author_ids)],
+                 publication_year=1900 + i % 120)
+            for i in range(books)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    libraries = Library.objects.bulk_create(
+        (Library(name=f"Bench Library {i}") for i in range(max(books // BOOKS_PER_LIBRARY, 1))),
+        batch_size=BATCH_SIZE,
+    )
+    Librarian.objects.bulk_create(
+        (Librarian(name=f"Bench Librarian {i}", library=library) for i, library in enumerate(libraries)),
+        batch_size=BATCH_SIZE,
+    )
+    book_ids = list(Book.objects.filter(pk__gt=last_book).order_by("pk").values_list("pk", flat=True))
+    Membership = Library.books.through
+    Membership.objects.bulk_create(
+        (
+            Membership(library_id=libraries[i // BOOKS_PER_LIBRARY % len(libraries)].pk, book_id=book_id)
+            for i, book_id in enumerate(book_ids)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    middle = len(libraries) // 2
+    return {
+        "books_by_author": (authors[len(authors) // 2].name,),
+        "books_in_library": (libraries[middle].name,),
+        "librarian_for_library": (libraries[middle].name,),
+        "catalogue": (),
+    }
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from bookshelf.models import UserProfile
+
+ROLE_KEY = "relationship_app:role:{}"
+# cached for users without a profile (or with a blank role) so they are not re-queried
+NO_ROLE = ""
+
+
+def role_cache_timeout():
+    return getattr(settings, "ROLE_CACHE_TIMEOUT", 3600)
+
+
+def get_role(user):
+    """
+    The user's UserProfile role, or None.
+    Looked up at most once per request (kept on the user object) and once per
+    cache lifetime; signals drop the cached value when the profile changes.
+    """
+    if not user.is_authenticated:
+        return None
+    if not hasattr(user, "_role"):
+        key = ROLE_KEY.format(user.pk)
+        role = cache.get(key)
+        if role is None:
+            role = (
+                UserProfile.objects.filter(user_id=user.pk).values_list("role", flat=True).first()
+                or NO_ROLE
+            )
+            cache.set(key, role, role_cache_timeout())
+        user._role = role
+    return user._role or None
+
+
+def forget_role(user_id):
+    cache.delete(ROLE_KEY.format(user_id))
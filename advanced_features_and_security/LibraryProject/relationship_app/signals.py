@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bookshelf.models import UserProfile
+
+from .roles import forget_role
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_role(sender, instance, **kwargs):
+    forget_role(instance.user_id)
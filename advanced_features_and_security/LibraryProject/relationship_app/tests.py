@@ -1,3 +1,178 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from LibraryProject.instrumentation import RequestMetrics
+from . import membership, query_samples
+from .models import Author, Book, Library
+
+
+class QueryCountTests(TestCase):
+    """
+    list_books and LibraryDetailView run a fixed number of queries,
+    whatever the size of the catalogue.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.library = Library.objects.create(name="Central")
+        for i in range(10):
+            author = Author.objects.create(name=f"Author {i}")
+            book = Book.objects.create(title=f"Book {i}", author=author)
+            cls.library.books.add(book)
+
+    def test_list_books(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("list_books"), secure=True)
+        self.assertContains(response, "Book 9 by Author 9")
+
+    def test_library_detail(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("library_detail", args=[self.library.pk]), secure=True)
+        self.assertContains(response, "Book 9 by Author 9")
+
+
+class InstrumentationMiddlewareTests(TestCase):
+    """
+    Server-Timing header, duplicate-query detection and the dev panel.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name="George Orwell")
+        for title in ("Animal Farm", "1984"):
+            Book.objects.create(title=title, author=author)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("list_books"), secure=True)
+        self.assertIn('db;dur=', response["Server-Timing"])
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+        self.assertIn('desc="0 duplicate queries"', response["Server-Timing"])
+
+    def test_detects_n_plus_one(self):
+        metrics = RequestMetrics()
+        with connection.execute_wrapper(metrics):
+            [book.author.name for book in Book.objects.all()]
+        self.assertEqual(metrics.query_count, 3)
+        self.assertEqual(list(metrics.duplicates.values()), [2])
+
+    @override_settings(INSTRUMENTATION_PANEL=True)
+    def test_dev_panel(self):
+        response = self.client.get(reverse("list_books"), secure=True)
+        self.assertContains(response, 'id="instrumentation-panel"')
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+
+
+class RoleViewTests(TestCase):
+    """
+    Role-gated views resolve the role from the cache, not the profile table.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("alice", "alice@example.com", "pass")
+        self.user.profile.role = "Librarian"
+        self.user.profile.save()
+        self.client.force_login(self.user)
+
+    def test_role_is_cached(self):
+        self.assertEqual(self.client.get(reverse("librarian_view"), secure=True).status_code, 200)
+        # session + user only: the role comes from the cache
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("librarian_view"), secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(reverse("admin_view"), secure=True).status_code, 302)
+
+    def test_profile_save_invalidates(self):
+        self.client.get(reverse("librarian_view"), secure=True)
+        self.user.profile.role = "Admin"
+        self.user.profile.save()
+        self.assertEqual(self.client.get(reverse("admin_view"), secure=True).status_code, 200)
+        self.assertEqual(self.client.get(reverse("librarian_view"), secure=True).status_code, 302)
+
+    def test_user_without_profile(self):
+        self.user.profile.delete()
+        self.assertEqual(self.client.get(reverse("member_view"), secure=True).status_code, 302)
+        anonymous = self.client_class()
+        self.assertEqual(anonymous.get(reverse("member_view"), secure=True).status_code, 302)
+
+
+class LibraryMembershipTests(TestCase):
+    """
+    Bulk add / remove / sync / CSV import of Library.books.
+    """
+
+    def setUp(self):
+        author = Author.objects.create(name="George Orwell")
+        self.books = [Book.objects.create(title=f"Book {i}", author=author) for i in range(6)]
+        self.ids = [book.pk for book in self.books]
+        self.library = Library.objects.create(name="Central")
+
+    def held(self):
+        return set(self.library.books.values_list("pk", flat=True))
+
+    def test_add_is_idempotent_and_chunked(self):
+        with patch.object(membership, "CHUNK_SIZE", 2):
+            membership.add_books(self.library, self.ids[:4])
+            membership.add_books(self.library, self.ids[2:])
+        self.assertEqual(self.held(), set(self.ids))
+
+    def test_remove(self):
+        membership.add_books(self.library, self.ids)
+        self.assertEqual(membership.remove_books(self.library, self.ids[:2] + [999]), 2)
+        self.assertEqual(self.held(), set(self.ids[2:]))
+
+    def test_sync_touches_only_the_difference(self):
+        membership.add_books(self.library, self.ids[:4])
+        self.assertEqual(membership.sync_books(self.library, self.ids[2:]), (2, 2))
+        self.assertEqual(self.held(), set(self.ids[2:]))
+
+    def test_read_book_ids_from_csv(self):
+        ids, unknown = membership.read_book_ids(io.StringIO("title\nBook 1\nBook 2\nMissing\n"))
+        self.assertEqual(ids, self.ids[1:3])
+        self.assertEqual(unknown, ["Missing"])
+        ids, unknown = membership.read_book_ids(io.StringIO(f"book_id\n{self.ids[0]}\n999\n"))
+        self.assertEqual((ids, unknown), ([self.ids[0]], [999]))
+        with self.assertRaises(ValueError):
+            membership.read_book_ids(io.StringIO("isbn\n123\n"))
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as csv_file:
+            csv_file.write("book_id\n" + "\n".join(map(str, self.ids[:3])) + "\n")
+        self.addCleanup(os.remove, csv_file.name)
+        call_command("library_books", "Central", "sync", csv_file.name, stdout=io.StringIO())
+        self.assertEqual(self.held(), set(self.ids[:3]))
+
+
+class QuerySampleTests(TestCase):
+    """
+    Naive and optimized query patterns return the same data; the benchmark
+    command writes JSON.
+    """
+
+    def test_variants_agree(self):
+        arguments = query_samples.generate(2000)
+        for name, (naive, optimized) in query_samples.PATTERNS.items():
+            expected = naive(*arguments[name])
+            result = optimized(*arguments[name])
+            if isinstance(expected, list):
+                self.assertCountEqual(result, expected, name)
+            else:
+                self.assertEqual(result, expected, name)
+
+    def test_benchmark_command_json(self):
+        output = io.StringIO()
+        call_command("benchmark_queries", "--scale", "1000", "--repeat", "1", stdout=output, stderr=io.StringIO())
+        report = json.loads(output.getvalue())
+        self.assertEqual(len(report["results"]), 2 * len(query_samples.PATTERNS))
+        catalogue = {r["variant"]: r["queries"] for r in report["results"] if r["pattern"] == "catalogue"}
+        self.assertEqual(catalogue["optimized"], 2)
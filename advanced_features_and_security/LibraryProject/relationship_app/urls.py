@@ -21,6 +21,6 @@ urlpatterns = [
     path('logout/', LogoutView.as_view(template_name="relationship_app/logout.html"), name='logout'),
 
     path('add_book/', views.add_book, name='add_book'),
-    path('edit_book/', views.edit_book, name='edit_book'),
-    path('delete_book/', views.delete_book, name='delete_book'),
+    path('edit_book/<int:pk>/', views.edit_book, name='edit_book'),
+    path('delete_book/<int:pk>/', views.delete_book, name='delete_book'),
 ]
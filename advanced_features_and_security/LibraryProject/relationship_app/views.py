@@ -7,12 +7,13 @@ from .models import Library, Book
 
 # Function-based view to list all books
 def list_books(request):
-    books = Book.objects.all()
+    books = Book.objects.with_authors()
     return render(request, "relationship_app/list_books.html", {"books": books})
 
 # Class-based view to show details of a specific library
 class LibraryDetailView(DetailView):
     model = Library
+    queryset = Library.objects.with_books_and_authors()
     template_name = "relationship_app/library_detail.html"
     context_object_name = "library"
 
@@ -63,14 +64,17 @@ def logout_view(request):
 
 from django.contrib.auth.decorators import user_passes_test
 
+from .roles import get_role
+
+# Role checks use the cached role (see roles.py); users without a profile get False
 def is_admin(user):
-    return user.userprofile.role == 'Admin'
+    return get_role(user) == 'Admin'
 
 def is_librarian(user):
-    return user.userprofile.role == 'Librarian'
+    return get_role(user) == 'Librarian'
 
 def is_member(user):
-    return hasattr(user, 'userprofile') and user.userprofile.role == 'Member'
+    return get_role(user) == 'Member'
 
 
 
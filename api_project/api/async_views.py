@@ -0,0 +1,54 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404
+from django.views import View
+from rest_framework.response import Response
+
+from .views import BookViewSet
+
+
+class AsyncBookViewSetView(View):
+    """
+    Async GET wrapper around one read action of BookViewSet.
+
+    Token/session authentication and permissions are synchronous DRF code and
+    run in a worker thread; the list/detail query itself uses the async ORM
+    (aiterator / aget), so under ASGI the event loop stays free while it runs.
+    """
+    action = None
+
+    def make_view(self, request, args, kwargs):
+        view = BookViewSet()
+        view.action_map = {"get": self.action}
+        view.args = args
+        view.kwargs = kwargs
+        view.request = view.initialize_request(request, *args, **kwargs)
+        view.headers = view.default_response_headers
+        return view
+
+    async def get(self, request, *args, **kwargs):
+        view = self.make_view(request, args, kwargs)
+        try:
+            await sync_to_async(view.initial)(view.request, *args, **kwargs)
+            response = await getattr(self, self.action)(view)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+        response = view.finalize_response(view.request, response, *args, **kwargs)
+        return await sync_to_async(response.render)()
+
+    async def list(self, view):
+        queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+        fields = view.get_requested_fields()
+        if fields:
+            queryset = queryset.values(*fields)
+        books = [book async for book in queryset.aiterator()]
+        return Response(view.get_serializer(books, many=True).data)
+
+    async def retrieve(self, view):
+        queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+        try:
+            book = await queryset.aget(pk=view.kwargs["pk"])
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        await sync_to_async(view.check_object_permissions)(view.request, book)
+        return Response(view.get_serializer(book).data)
@@ -0,0 +1,143 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+
+TOKEN_KEY = "api:token:{}"
+EPOCH_KEY = "api:token:epoch"
+
+
+class TokenCache:
+    """
+    Two-level cache of token key -> (user, token).
+
+    - a bounded in-process LRU (settings.API_TOKEN_CACHE_SIZE entries, each
+      trusted for at most API_TOKEN_CACHE_TIMEOUT seconds)
+    - an optional shared cache behind it (API_TOKEN_SHARED_CACHE, a CACHES
+      alias; None disables it)
+
+    Revocation deletes the key from both levels and bumps a shared epoch
+    counter; LRU entries remember the epoch they were filled under, so every
+    process drops its local copies on its next lookup. Without a shared cache
+    revocation only reaches the current process.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = {"lru": 0, "shared": 0}
+        self.misses = 0
+
+    @property
+    def max_size(self):
+        return getattr(settings, "API_TOKEN_CACHE_SIZE", 1024)
+
+    @property
+    def timeout(self):
+        return getattr(settings, "API_TOKEN_CACHE_TIMEOUT", 300)
+
+    @property
+    def shared(self):
+        alias = getattr(settings, "API_TOKEN_SHARED_CACHE", None)
+        return caches[alias] if alias else None
+
+    def epoch(self):
+        shared = self.shared
+        return shared.get(EPOCH_KEY, 0) if shared else 0
+
+    def get(self, key):
+        epoch = self.epoch()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, entry_epoch, expires = entry
+                if entry_epoch == epoch and expires > time.monotonic():
+                    self.entries.move_to_end(key)
+                    self.hits["lru"] += 1
+                    return value
+                del self.entries[key]
+
+        shared = self.shared
+        value = shared.get(TOKEN_KEY.format(key)) if shared else None
+        if value is not None:
+            self._remember(key, value, epoch)
+            with self.lock:
+                self.hits["shared"] += 1
+            return value
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        shared = self.shared
+        if shared:
+            shared.set(TOKEN_KEY.format(key), value, self.timeout)
+        self._remember(key, value, self.epoch())
+
+    def _remember(self, key, value, epoch):
+        with self.lock:
+            self.entries[key] = (value, epoch, time.monotonic() + self.timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def revoke(self, keys):
+        keys = list(keys)
+        if not keys:
+            # nothing cached to drop; don't make every process refill its LRU
+            return
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+        shared = self.shared
+        if shared:
+            shared.delete_many([TOKEN_KEY.format(key) for key in keys])
+            try:
+                shared.incr(EPOCH_KEY)
+            except ValueError:
+                shared.set(EPOCH_KEY, 1, timeout=None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = {"lru": 0, "shared": 0}
+            self.misses = 0
+
+    def stats(self):
+        with self.lock:
+            hits = self.hits["lru"] + self.hits["shared"]
+            lookups = hits + self.misses
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "lru_hits": self.hits["lru"],
+                "shared_hits": self.hits["shared"],
+                "misses": self.misses,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that serves known tokens from `token_cache` instead of
+    querying Token and User on every request. Only successful lookups are
+    cached; signals revoke entries when a token or its user changes.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            cached = super().authenticate_credentials(key)
+            token_cache.set(key, cached)
+        user, token = cached
+        # hand out a copy so per-request state (e.g. permission caches) never
+        # sticks to the cached instance
+        return copy.copy(user), token
@@ -0,0 +1,43 @@
+import time
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.request import Request
+from rest_framework.throttling import UserRateThrottle
+
+from api.throttling import SlidingWindowThrottle
+
+
+class Command(BaseCommand):
+    help = (
+        "Per-request overhead and stored state of DRF's UserRateThrottle "
+        "(timestamp list) versus SlidingWindowThrottle (window counters) "
+        "against a private in-process cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=10_000)
+        parser.add_argument("--rate", default="100000/hour", help="high enough that nothing is rejected")
+
+    def handle(self, *args, **options):
+        request = Request(RequestFactory().post("/api/books_all/"))
+        request.user = type("BenchUser", (), {"pk": 1, "is_authenticated": True})()
+        for label, base in (("drf", UserRateThrottle), ("sliding", SlidingWindowThrottle)):
+            store = LocMemCache(f"throttle-bench-{label}", {})
+            throttle_class = type(
+                f"{label}Bench", (base,), {"scope": "bench", "rate": options["rate"], "cache": store}
+            )
+            self.run(label, throttle_class, store, request, options["requests"])
+
+    def run(self, label, throttle_class, store, request, requests):
+        start = time.perf_counter()
+        for _ in range(requests):
+            throttle = throttle_class()
+            assert throttle.allow_request(request, None)
+        elapsed = time.perf_counter() - start
+        # LocMemCache keeps pickled values
+        state = sum(len(value) for value in store._cache.values())
+        self.stdout.write(
+            f"{label:>8}: {elapsed / requests * 1e6:8.1f} us/request  state {state} bytes after {requests} requests"
+        )
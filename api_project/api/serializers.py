@@ -1,7 +1,44 @@
 from rest_framework import serializers
+from api_project.instrumentation import serializing
 from .models import Book
 
-class BookSerializer(serializers.ModelSerializer):
+
+class TimedListSerializer(serializers.ListSerializer):
+    """ListSerializer whose `.data` is timed like TimedSerializerMixin's."""
+
+    @property
+    def data(self):
+        with serializing():
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Times building `.data` into the request's instrumentation metrics
+    (Server-Timing serialize;dur). many=True lists are timed once, as a whole,
+    by TimedListSerializer, set as the Meta.list_serializer_class.
+    """
+
+    @property
+    def data(self):
+        with serializing():
+            return super().data
+
+
+class BookSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializes books. Pass `fields=[...]` to keep only those fields
+    (sparse fieldsets, see SparseFieldsetMixin).
+    """
+
     class Meta:
         model = Book
         fields = '__all__'   # include all fields from Book model
+        list_serializer_class = TimedListSerializer
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
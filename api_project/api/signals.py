@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+
+# User fields that decide whether, and as whom, a token authenticates
+AUTH_FIELDS = ("password", "is_active", "is_staff", "is_superuser")
+
+
+def auth_state(user):
+    # __dict__ so deferred fields are not loaded just to be compared
+    return tuple(user.__dict__.get(name) for name in AUTH_FIELDS)
+
+
+# Token cache revocation
+
+@receiver(post_delete, sender=Token)
+def revoke_deleted_token(sender, instance, **kwargs):
+    # also covers rotation (the key is the primary key) and deleted users,
+    # whose tokens cascade
+    token_cache.revoke([instance.key])
+
+
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def remember_auth_state(sender, instance, **kwargs):
+    instance._auth_state = auth_state(instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def revoke_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    # Logins (update_fields={"last_login"}) and profile edits leave the
+    # cached user good enough; only auth changes make it stale
+    if update_fields is not None and not set(AUTH_FIELDS) & set(update_fields):
+        return
+    state = auth_state(instance)
+    changed = state != instance._auth_state
+    instance._auth_state = state
+    if changed and not created:
+        token_cache.revoke(Token.objects.filter(user=instance).values_list("key", flat=True))
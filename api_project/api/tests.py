@@ -1,3 +1,279 @@
-from django.test import TestCase
+import json
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .authentication import token_cache
+from .models import Book
+from .throttling import BookWriteThrottle, SlidingWindowThrottle, TokenObtainThrottle
+
+
+class AsyncBookViewSetTests(APITestCase):
+    """
+    The async BookViewSet list/retrieve views match the sync ones and keep
+    token authentication.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="reader", password="readerpass")
+        self.token = Token.objects.create(user=self.user)
+        self.book = Book.objects.create(title="Animal Farm", author="George Orwell")
+        Book.objects.create(title="1984", author="George Orwell")
+
+    def authenticate(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_requires_authentication(self):
+        response = self.client.get(reverse("async_book_all-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_matches_sync_view(self):
+        self.authenticate()
+        response = self.client.get(reverse("async_book_all-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), self.client.get(reverse("book_all-list")).json())
+
+    def test_retrieve(self):
+        self.authenticate()
+        url = reverse("async_book_all-detail", args=[self.book.pk])
+        self.assertEqual(self.client.get(url).json(), {"id": self.book.pk, "title": "Animal Farm", "author": "George Orwell"})
+        missing = self.client.get(reverse("async_book_all-detail", args=[999]))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=1)
+    def test_serialization_is_timed(self):
+        self.authenticate()
+        with self.assertLogs("instrumentation") as logs:
+            response = self.client.get(reverse("book_all-list"))
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertGreater(record["serialize_ms"], 0)
+        self.assertIn(f'serialize;dur={record["serialize_ms"]}', response["Server-Timing"])
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """
+    Cached token lookups, revocation and hit-ratio stats.
+    """
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username="reader", password="readerpass")
+        self.token = Token.objects.create(user=self.user)
+        Book.objects.create(title="Animal Farm", author="George Orwell")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.url = reverse("book_all-list")
+
+    def test_cached_requests_skip_auth_queries(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = token_cache.stats()
+        self.assertEqual((stats["lru_hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_deleted_token_is_revoked(self):
+        self.client.get(self.url)
+        self.token.delete()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_revoked(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_revoked(self):
+        self.client.get(self.url)
+        self.user.delete()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_refreshes_the_cache(self):
+        self.client.get(self.url)
+        self.user.set_password("newpass")
+        self.user.save()
+        self.client.get(self.url)
+        self.assertEqual(token_cache.stats()["misses"], 2)
+
+    @override_settings(API_TOKEN_SHARED_CACHE="default")
+    def test_logins_and_profile_edits_keep_the_cache(self):
+        self.client.get(self.url)
+        epoch = token_cache.epoch()
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=["last_login"])
+        self.user.first_name = "Eric"
+        with self.assertNumQueries(1):
+            self.user.save()
+        self.assertEqual(token_cache.epoch(), epoch)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    @override_settings(API_TOKEN_SHARED_CACHE="default")
+    def test_revoking_no_keys_keeps_the_epoch(self):
+        epoch = token_cache.epoch()
+        token_cache.revoke([])
+        self.assertEqual(token_cache.epoch(), epoch)
+
+    @override_settings(API_TOKEN_CACHE_SIZE=1)
+    def test_lru_is_bounded(self):
+        other = Token.objects.create(user=User.objects.create_user(username="other", password="pass"))
+        self.client.get(self.url)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {other.key}")
+        self.client.get(self.url)
+        self.assertEqual(token_cache.stats()["size"], 1)
+
+    @override_settings(API_TOKEN_SHARED_CACHE="default")
+    def test_shared_cache_refills_lru_after_epoch_bump(self):
+        self.client.get(self.url)
+        # another process revoking some other token bumps the shared epoch
+        token_cache.revoke(["unrelated"])
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        self.assertEqual(token_cache.stats()["shared_hits"], 1)
+
+    def test_stats_endpoint_is_admin_only(self):
+        self.assertEqual(self.client.get(reverse("token-cache-stats")).status_code, status.HTTP_403_FORBIDDEN)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse("token-cache-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("hit_ratio", response.data)
+
+
+class SparseFieldsetTests(APITestCase):
+    """
+    ?fields= limits both the selected columns and the serialized fields.
+    """
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username="reader", password="readerpass")
+        self.client.force_authenticate(self.user)
+        self.book = Book.objects.create(title="Animal Farm", author="George Orwell")
+
+    def test_list_selects_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("book_all-list"), {"fields": "id,title"})
+        self.assertEqual(response.json(), [{"id": self.book.pk, "title": "Animal Farm"}])
+        self.assertNotIn('"author"', ctx.captured_queries[-1]["sql"])
+
+    def test_retrieve_and_async_list(self):
+        response = self.client.get(reverse("book_all-detail", args=[self.book.pk]), {"fields": "title"})
+        self.assertEqual(response.json(), {"title": "Animal Farm"})
+        response = self.client.get(reverse("async_book_all-list"), {"fields": "author"})
+        self.assertEqual(response.json(), [{"author": "George Orwell"}])
+
+    def test_unknown_field(self):
+        response = self.client.get(reverse("book_all-list"), {"fields": "title,isbn"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["fields"], ["Unknown field(s): isbn."])
+
+    def test_writes_ignore_fields(self):
+        response = self.client.post(
+            reverse("book_all-list") + "?fields=id", {"title": "1984", "author": "George Orwell"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set(response.data), {"id", "title", "author"})
+
+
+class SlidingWindowThrottleTests(APITestCase):
+    """
+    Write and token endpoints are rate limited with O(1) counters.
+    """
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user = User.objects.create_user(username="reader", password="readerpass")
+        self.client.force_authenticate(self.user)
+
+    @patch.object(BookWriteThrottle, "THROTTLE_RATES", {"book_writes": "3/min"})
+    def test_book_writes_are_throttled_reads_are_not(self):
+        url = reverse("book_all-list")
+        for i in range(3):
+            response = self.client.post(url, {"title": f"Book {i}", "author": "Someone"})
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(url, {"title": "One too many", "author": "Someone"})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    @patch.object(TokenObtainThrottle, "THROTTLE_RATES", {"token_obtain": "2/min"})
+    def test_obtain_auth_token_is_throttled(self):
+        self.client.force_authenticate(None)
+        url = reverse("api_token_auth")
+        credentials = {"username": "reader", "password": "readerpass"}
+        self.assertEqual(self.client.post(url, credentials).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post(url, credentials).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post(url, credentials).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_previous_window_decays(self):
+        now = [120.0]
+        throttle_class = type(
+            "Throttle", (SlidingWindowThrottle,),
+            {"scope": "test", "rate": "4/min", "timer": lambda self: now[0]},
+        )
+        request = type("Request", (), {"user": self.user})()
+        self.assertEqual([throttle_class().allow_request(request, None) for _ in range(5)], [True] * 4 + [False])
+        # 45s into the next window the previous 4 requests weigh 4 * 0.25 = 1
+        now[0] = 225.0
+        self.assertEqual([throttle_class().allow_request(request, None) for _ in range(4)], [True] * 3 + [False])
+        # state is one counter per window, whatever the request count
+        self.assertEqual(cache.get(f"throttle:test:{self.user.pk}:3"), 3)
+
+    def make_throttle(self, now):
+        return type(
+            "Throttle", (SlidingWindowThrottle,),
+            {"scope": "test", "rate": "4/min", "timer": lambda self: now[0]},
+        )
+
+    def test_wait_is_exact(self):
+        """A request is allowed exactly after wait() seconds, not before"""
+        now = [120.0]
+        throttle_class = self.make_throttle(now)
+        request = type("Request", (), {"user": self.user})()
+        for _ in range(4):
+            throttle_class().allow_request(request, None)
+        throttle = throttle_class()
+        self.assertFalse(throttle.allow_request(request, None))
+        # into the next window until 4 * (1 - t/60) + 1 <= 4: t = 15s
+        self.assertEqual(throttle.wait(), 75)
+        now[0] = 194.0
+        self.assertFalse(throttle_class().allow_request(request, None))
+        now[0] = 195.0
+        self.assertTrue(throttle_class().allow_request(request, None))
+
+        # within this window: 4 * 0.75 + 1 = 4 is full; a second request fits
+        # once 4 * (1 - t/60) + 2 <= 4, at t = 30s
+        throttle = throttle_class()
+        self.assertFalse(throttle.allow_request(request, None))
+        self.assertEqual(throttle.wait(), 15)
+        now[0] = 209.0
+        self.assertFalse(throttle_class().allow_request(request, None))
+        now[0] = 210.0
+        self.assertTrue(throttle_class().allow_request(request, None))
+
+    def test_counter_evicted_between_add_and_incr(self):
+        throttle_class = self.make_throttle([120.0])
+        request = type("Request", (), {"user": self.user})()
+        incr = LocMemCache.incr
+        evicted = []
+
+        def evicting_incr(cache, key, delta=1, version=None):
+            if not evicted:
+                evicted.append(key)
+                cache.delete(key, version=version)
+            return incr(cache, key, delta, version)
+
+        with patch.object(LocMemCache, "incr", evicting_incr):
+            self.assertTrue(throttle_class().allow_request(request, None))
+        self.assertEqual(cache.get(f"throttle:test:{self.user.pk}:2"), 1)
@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Sliding-window-counter throttle with O(1) state per key.
+
+    DRF's SimpleRateThrottle keeps a list of request timestamps per key and
+    rewrites it on every request. Here each key has one integer counter per
+    fixed window; the rate over the last `duration` seconds is estimated as
+
+        previous_window_count * (1 - fraction_of_current_window_elapsed)
+        + current_window_count
+
+    Each request costs one get_many() and one atomic incr(), so it works on
+    the in-process cache or a shared one such as Redis
+    (settings.API_THROTTLE_CACHE, default "default").
+    """
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, "API_THROTTLE_CACHE", "default")]
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, self.offset = divmod(self.now, self.duration)
+        current_key = f"{self.key}:{int(window)}"
+        previous_key = f"{self.key}:{int(window) - 1}"
+
+        self.current = self.increment(current_key)
+        self.previous = self.cache.get(previous_key, 0)
+        estimate = self.previous * (1 - self.offset / self.duration) + self.current
+        if estimate > self.num_requests:
+            # rejected requests do not use up capacity
+            self.current -= 1
+            try:
+                self.cache.decr(current_key)
+            except ValueError:
+                pass  # evicted meanwhile: nothing to give back
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def increment(self, key):
+        # counters outlive their own window by one more, while they are "previous"
+        timeout = self.duration * 2
+        self.cache.add(key, 0, timeout)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # evicted between add() and incr()
+            if self.cache.add(key, 1, timeout):
+                return 1
+            return self.cache.incr(key)
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """
+        Seconds until a request would be allowed, assuming no others arrive.
+        A request fits once previous * weight + current + 1 <= num_requests.
+        """
+        capacity = self.num_requests - 1
+        remaining = self.duration - self.offset
+        # later in this window, as the previous window's weight decays
+        if self.previous and self.current <= capacity:
+            until = self.duration * (1 - (capacity - self.current) / self.previous) - self.offset
+            if until < remaining:
+                return max(until, 0)
+        # in the next window this window's count is "previous", at full weight
+        # at its start, decaying from there
+        if self.current > capacity:
+            return remaining + self.duration * (1 - capacity / self.current)
+        return remaining
+
+
+class BookWriteThrottle(SlidingWindowThrottle):
+    """Limits create/update/delete on BookViewSet; reads are not throttled."""
+    scope = "book_writes"
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        return super().allow_request(request, view)
+
+
+class TokenObtainThrottle(SlidingWindowThrottle):
+    """Limits token requests (password guessing) per client IP."""
+    scope = "token_obtain"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
@@ -1,11 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BookList, BookViewSet
+from .views import BookList, BookViewSet, TokenCacheStatsView
+from .async_views import AsyncBookViewSetView
 
 router = DefaultRouter()
 router.register(r'books_all', BookViewSet, basename='book_all')
 
 urlpatterns = [
     path('books/', BookList.as_view(), name='book-list'),
+    path('auth/token-cache/', TokenCacheStatsView.as_view(), name='token-cache-stats'),
+    # async (ASGI) variants of BookViewSet list / retrieve
+    path('async/books_all/', AsyncBookViewSetView.as_view(action='list'), name='async_book_all-list'),
+    path('async/books_all/<int:pk>/', AsyncBookViewSetView.as_view(action='retrieve'), name='async_book_all-detail'),
     path('', include(router.urls)),
 ]
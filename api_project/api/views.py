@@ -1,15 +1,78 @@
 from django.shortcuts import render
 from rest_framework import generics, viewsets
+from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .authentication import token_cache
 from .models import Book
 from .serializers import BookSerializer
+from .throttling import BookWriteThrottle, TokenObtainThrottle
 
-class BookList(generics.ListAPIView):
+class SparseFieldsetMixin:
+    """
+    `?fields=id,title` on GET requests: only those columns are selected
+    (.values() for lists, .only() for single objects) and serialized.
+    Assumes serializer field names are model field names.
+    """
+    fields_param = 'fields'
+
+    def get_requested_fields(self):
+        if not hasattr(self, '_requested_fields'):
+            self._requested_fields = None
+            raw = self.request.query_params.get(self.fields_param, '') if self.request.method == 'GET' else ''
+            requested = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+            if requested:
+                unknown = [name for name in requested if name not in self.get_serializer_class()().fields]
+                if unknown:
+                    raise ValidationError({self.fields_param: [f"Unknown field(s): {', '.join(unknown)}."]})
+                self._requested_fields = requested
+        return self._requested_fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        return queryset.only(*fields) if fields else queryset
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if not fields:
+            return super().list(request, *args, **kwargs)
+        # plain dict rows: no model instances are built
+        queryset = self.filter_queryset(self.get_queryset()).values(*fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+
+class BookList(SparseFieldsetMixin, generics.ListAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [BookWriteThrottle]
+
+
+class ThrottledObtainAuthToken(ObtainAuthToken):
+    """obtain_auth_token with a per-IP rate limit."""
+    throttle_classes = [TokenObtainThrottle]
+
+
+class TokenCacheStatsView(APIView):
+    """Hit ratio and size of this process's token cache (admins only)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(token_cache.stats())
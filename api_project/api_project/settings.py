@@ -44,15 +44,32 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # Used by the sliding-window throttles in api.throttling
+    'DEFAULT_THROTTLE_RATES': {
+        'book_writes': '60/min',
+        'token_obtain': '10/min',
+    },
 }
 
+# Cache alias holding throttle counters; point at a shared cache (e.g. Redis)
+# when running several processes
+API_THROTTLE_CACHE = 'default'
+
+# Token authentication cache (see api.authentication.TokenCache)
+API_TOKEN_CACHE_SIZE = 1024
+API_TOKEN_CACHE_TIMEOUT = 300
+# CACHES alias shared by all processes (e.g. Redis/Memcached) for cross-process
+# revocation; None keeps the cache process-local
+API_TOKEN_SHARED_CACHE = None
+
 MIDDLEWARE = [
+    'api_project.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -133,3 +150,19 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Request instrumentation (api_project/instrumentation.py): Server-Timing on every
+# response, a JSON log line for this fraction of requests, and an HTML panel
+# when DEBUG is on
+INSTRUMENTATION_SAMPLE_RATE = 0.01
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'instrumentation': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
@@ -0,0 +1,84 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+VERSION_KEY = "blog:version:{}"
+PAGE_KEY = "blog:page:{}:{}"
+
+# What each scope covers; signals bump the version when one of these is written.
+SCOPES = ("posts", "comments", "tags")
+
+
+def get_versions(*scopes):
+    """
+    Current version number of each scope, e.g. {"posts": ..., "tags": ...}.
+    Missing versions (never set or evicted) are initialised from the clock so
+    an evicted counter can never come back to an old, still-cached value.
+    """
+    scopes = scopes or SCOPES
+    keys = {scope: VERSION_KEY.format(scope) for scope in scopes}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for scope, key in keys.items():
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+        versions[scope] = found[key]
+    return versions
+
+
+def bump_version(scope):
+    """Invalidate every page and fragment cached under `scope`."""
+    key = VERSION_KEY.format(scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def page_cache_key(request, versions):
+    version = ".".join(str(versions[scope]) for scope in sorted(versions))
+    return PAGE_KEY.format(version, request.get_full_path())
+
+
+class CachedPageMixin:
+    """
+    Full-page cache for anonymous GET requests.
+    The key combines the URL with the versions of `cache_scopes`, so a write to
+    any of those scopes makes old pages unreachable instead of deleting them.
+    Views also get `cache_versions` in their context for fragment caching.
+    """
+    cache_scopes = SCOPES
+
+    def get_cache_timeout(self):
+        return getattr(settings, "BLOG_PAGE_CACHE_TIMEOUT", 300)
+
+    def dispatch(self, request, *args, **kwargs):
+        self.cache_versions = get_versions(*SCOPES)
+        if request.method != "GET" or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+
+        key = page_cache_key(
+            request, {scope: self.cache_versions[scope] for scope in self.cache_scopes}
+        )
+        response = cache.get(key)
+        if response is not None:
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        patch_vary_headers(response, ("Cookie",))
+        if response.status_code == 200:
+            timeout = self.get_cache_timeout()
+            if hasattr(response, "render") and callable(response.render):
+                response.add_post_render_callback(lambda r: cache.set(key, r, timeout))
+            else:
+                cache.set(key, response, timeout)
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["cache_versions"] = self.cache_versions
+        context["fragment_timeout"] = self.get_cache_timeout()
+        return context
@@ -0,0 +1,75 @@
+from django.db import transaction
+from django.db.models import Count, QuerySet, F, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Comment, Post
+
+
+def _latest_comment_at():
+    return Subquery(
+        Comment.objects.filter(post=OuterRef("pk"))
+        .order_by("-created_at")
+        .values("created_at")[:1]
+    )
+
+
+def comment_added(comment):
+    """Bump the post's counters in a single UPDATE (no read-modify-write)."""
+    Post.objects.filter(pk=comment.post_id).update(
+        comment_count=F("comment_count") + 1,
+        last_comment_at=Greatest(Coalesce("last_comment_at", Value(comment.created_at)), Value(comment.created_at)),
+    )
+
+
+def comment_removed(comment):
+    Post.objects.filter(pk=comment.post_id, comment_count__gt=0).update(
+        comment_count=F("comment_count") - 1,
+        last_comment_at=_latest_comment_at(),
+    )
+
+
+def deletes_posts(origin):
+    """True when `origin` (the object or queryset a delete started from) is post(s)."""
+    if isinstance(origin, QuerySet):
+        return origin.model is Post
+    return isinstance(origin, Post)
+
+
+def recount_after_delete(origin, post_id):
+    """
+    For comments removed by a cascade or a queryset delete: gather their posts
+    on `origin` and recount them with one UPDATE once the delete has committed,
+    instead of one UPDATE per comment.
+    """
+    pending = getattr(origin, "_recount_post_ids", None)
+    if pending is None:
+        pending = origin._recount_post_ids = set()
+        transaction.on_commit(lambda: rebuild_comment_counts(Post.objects.filter(pk__in=pending)))
+    pending.add(post_id)
+
+
+def rebuild_comment_counts(queryset=None):
+    """
+    Recompute both counters from the Comment table in one UPDATE statement.
+    Returns the number of posts updated.
+    """
+    counts = (
+        Comment.objects.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    latest = (
+        Comment.objects.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(latest=Max("created_at"))
+        .values("latest")
+    )
+    if queryset is None:
+        queryset = Post.objects.all()
+    return queryset.update(
+        comment_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0),
+        last_comment_at=Subquery(latest),
+    )
@@ -1,9 +1,9 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
-from .models import Post, Tag
+from .models import Post
 from .models import Comment
-from taggit.forms import TagWidget
+from .tagging import parse_tag_names, set_post_tags
 
 class CustomUserCreationForm(UserCreationForm):
     email = forms.EmailField(required=True)
@@ -13,32 +13,40 @@ class CustomUserCreationForm(UserCreationForm):
         fields = ("username", "email", "password1", "password2")
 
 class PostForm(forms.ModelForm):
+    # Free-text, comma-separated tag names; resolved to Tag rows in save()
+    tags = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"placeholder": "django, orm, tips"}),
+    )
+
     class Meta:
         model = Post
-        fields = ['title', 'content', 'tags']  # include tags
-        widgets = {
-            'tags': TagWidget(),  # custom widget for tags
-        }
+        fields = ['title', 'content']
 
     def __init__(self, *args, **kwargs):
         # If editing an existing instance, pre-populate the tags field.
         super().__init__(*args, **kwargs)
+        self._current_tag_ids = set()
         if self.instance and self.instance.pk:
-            tag_names = ", ".join([t.name for t in self.instance.tags.all()])
-            self.fields['tags'].initial = tag_names
+            current = list(self.instance.tags.values_list("pk", "name"))
+            self._current_tag_ids = {pk for pk, _ in current}
+            self.fields['tags'].initial = ", ".join(name for _, name in current)
 
     def save(self, commit=True):
         # Save Post first, then handle tags
-        tags_text = self.cleaned_data.pop("tags", "")
         post = super().save(commit=commit)
-        # parse tag names, ignore empty names, strip whitespace
-        tag_names = [t.strip() for t in tags_text.split(",") if t.strip()]
-        tags = []
-        for name in tag_names:
-            tag_obj, _ = Tag.objects.get_or_create(name=name)
-            tags.append(tag_obj)
-        # set many-to-many (clear previous if editing)
-        post.tags.set(tags)
+        tag_names = parse_tag_names(self.cleaned_data.get("tags", ""))
+        if commit:
+            set_post_tags(post, tag_names, current_ids=self._current_tag_ids)
+        else:
+            # the post has no pk yet; tags are written together with save_m2m()
+            save_m2m = self.save_m2m
+
+            def save_m2m_and_tags():
+                save_m2m()
+                set_post_tags(post, tag_names, current_ids=self._current_tag_ids)
+
+            self.save_m2m = save_m2m_and_tags
         return post
 
 
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import rebuild_comment_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute Post.comment_count and Post.last_comment_at from the comments table."
+
+    def handle(self, *args, **options):
+        updated = rebuild_comment_counts()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt comment counters for {updated} posts."))
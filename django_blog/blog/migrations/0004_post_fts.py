@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+CREATE_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts
+USING fts5(title, content, tags, tokenize = 'unicode61 remove_diacritics 2')
+"""
+
+POPULATE_SQL = """
+INSERT INTO blog_post_fts (rowid, title, content, tags)
+SELECT p.id, p.title, p.content, COALESCE((
+    SELECT GROUP_CONCAT(t.name, ' ')
+    FROM blog_tag t
+    JOIN blog_post_tags pt ON pt.tag_id = t.id
+    WHERE pt.post_id = p.id
+), '')
+FROM blog_post p
+"""
+
+
+def create_fts_table(apps, schema_editor):
+    # FTS5 is SQLite-only; other databases use SimpleSearchBackend.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(CREATE_SQL)
+    schema_editor.execute(POPULATE_SQL)
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS blog_post_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_tag_post_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
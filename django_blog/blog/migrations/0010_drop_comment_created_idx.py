@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:57
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_tag_name_lower_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='blog_comment_created_idx',
+        ),
+    ]
@@ -1,21 +1,64 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.db.models.functions import Lower
+from django.utils.text import Truncator, slugify
+
+EXCERPT_WORDS = 20
+
+
+def make_excerpt(content):
+    # same output as the `truncatewords` template filter
+    return Truncator(content).words(EXCERPT_WORDS, truncate=" …")
 
 
 class Post(models.Model):
     """
     Post model for blog articles.
     Each post has a title, content, publication date, and an author (linked to Django's User).
+    `excerpt` is computed from content on save so listings never load the full body.
+    `comment_count` and `last_comment_at` are maintained by Comment signals
+    (see blog/signals.py) and rebuilt by `manage.py rebuild_comment_counts`.
     """
     title = models.CharField(max_length=200)
     content = models.TextField()
+    excerpt = models.TextField(blank=True, editable=False)
     published_date = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="posts")
-    tags = models.ManyToManyField('Tag', related_name='posts', blank=True)
+    tags = models.ManyToManyField('Tag', through='PostTag', related_name='posts', blank=True)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_comment_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # Columns only ever written with F()/subquery updates, never from instances
+    COUNTER_FIELDS = {"comment_count", "last_comment_at"}
+
+    class Meta:
+        indexes = [
+            # keyset pagination order of PostListView / PostByTagListView
+            models.Index(fields=["-published_date", "id"], name="blog_post_published_idx"),
+            # "most discussed" listings
+            models.Index(fields=["-comment_count", "-published_date"], name="blog_post_discussed_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None and not self._state.adding:
+            # Don't write back possibly stale counters (or deferred columns).
+            skip = self.COUNTER_FIELDS | self.get_deferred_fields()
+            update_fields = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skip
+            ]
+            kwargs["update_fields"] = update_fields
+        if update_fields is None or "content" in update_fields:
+            self.excerpt = make_excerpt(self.content)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "excerpt"}
+        super().save(*args, **kwargs)
+
+
 class Comment(models.Model):
     """
     Comment linked to a Post.
@@ -31,14 +74,59 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # comments of one post in display order (PostDetailView, CommentListView)
+            models.Index(fields=["post", "created_at"], name="blog_comment_post_created_idx"),
+        ]
+
     def __str__(self):
         return f"Comment by {self.author} on {self.post}"
     
 class Tag(models.Model):
     """
     Simple Tag model. Name is unique so we can get_or_create by name.
+    The slug (unique, so indexed) is what tag URLs use.
     """
     name = models.CharField(max_length=50, unique=True)
+    slug = models.SlugField(max_length=60, unique=True)
+
+    class Meta:
+        indexes = [
+            # case-insensitive name lookups of blog/tagging.py
+            models.Index(Lower("name"), name="blog_tag_name_lower_idx"),
+        ]
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = unique_tag_slug(self.name)
+        super().save(*args, **kwargs)
+
+
+def unique_tag_slug(name):
+    """slugify(name), suffixed with -2, -3, ... if another tag already has it."""
+    base = slugify(name)[:50] or "tag"
+    slug, n = base, 2
+    while Tag.objects.filter(slug=slug).exists():
+        slug = f"{base}-{n}"
+        n += 1
+    return slug
+
+
+class PostTag(models.Model):
+    """
+    Through table of Post.tags (keeps the original blog_post_tags table).
+    The (tag, post) index lets tag pages find their posts from the index alone.
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = "blog_post_tags"
+        unique_together = [("post", "tag")]
+        indexes = [
+            models.Index(fields=["tag", "post"], name="blog_posttag_tag_post_idx"),
+        ]
@@ -0,0 +1,79 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+
+def encode_cursor(post, ordering):
+    """Opaque cursor pointing just past `post` in `ordering`."""
+    values = (getattr(post, name.lstrip("-")) for name in ordering)
+    raw = "|".join(value.isoformat() if isinstance(value, datetime) else str(value) for value in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, model, ordering):
+    """Field values of the row a cursor points past, typed by the model fields."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        values = raw.split("|")
+        if len(values) != len(ordering):
+            raise ValueError
+        return [
+            model._meta.get_field(name.lstrip("-")).to_python(value)
+            for name, value in zip(ordering, values)
+        ]
+    except (binascii.Error, UnicodeError, ValueError, ValidationError):
+        raise Http404("Invalid cursor.")
+
+
+def keyset_filter(ordering, values):
+    """Rows strictly after `values` in `ordering`: (a < x) | (a = x & b > y) | ..."""
+    condition = Q()
+    for i, name in enumerate(ordering):
+        field = name.lstrip("-")
+        lookup = "lt" if name.startswith("-") else "gt"
+        step = Q(**{f"{field}__{lookup}": values[i]})
+        for previous, value in zip(ordering[:i], values):
+            step &= Q(**{previous.lstrip("-"): value})
+        condition |= step
+    return condition
+
+
+class KeysetPaginationMixin:
+    """
+    Keyset (cursor) pagination for ListViews over posts.
+    Rows are ordered by one of `orderings` (chosen with ?sort=, the first is
+    the default) and each page filters on the last row of the previous one
+    instead of using OFFSET, so every page costs the same single query however
+    deep the reader goes. Every ordering ends in a unique column and has an
+    index that matches it.
+    """
+    paginate_by = 10
+    cursor_param = "cursor"
+    sort_param = "sort"
+    orderings = {"newest": ("-published_date", "id")}
+
+    def get_sort(self):
+        sort = self.request.GET.get(self.sort_param)
+        return sort if sort in self.orderings else next(iter(self.orderings))
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = self.orderings[self.get_sort()]
+        cursor = self.request.GET.get(self.cursor_param)
+        if cursor:
+            queryset = queryset.filter(keyset_filter(ordering, decode_cursor(cursor, queryset.model, ordering)))
+        # fetch one extra row to know whether there is a next page
+        rows = list(queryset.order_by(*ordering)[:page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_cursor = encode_cursor(rows[-1], ordering) if has_next else None
+        return None, None, rows, bool(cursor) or has_next
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["next_cursor"] = getattr(self, "next_cursor", None)
+        context["sort"] = self.get_sort()
+        return context
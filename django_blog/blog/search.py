@@ -0,0 +1,147 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import Post
+
+FTS_TABLE = "blog_post_fts"
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class BaseSearchBackend:
+    """
+    Interface every blog search backend implements.
+    - search(query) returns something the Paginator can count and slice
+    - index_post / remove_post keep the backend in sync with the Post table
+    """
+
+    def search(self, query):
+        raise NotImplementedError
+
+    def index_post(self, post):
+        pass
+
+    def remove_post(self, post_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """
+    Fallback backend: icontains scan over title, content and tag names.
+    Needs no index, so it works on every database.
+    """
+
+    def search(self, query):
+        return Post.objects.filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query) |
+            Q(tags__name__icontains=query)
+        ).distinct().order_by("-published_date")
+
+
+class FTSResults:
+    """
+    Lazy, sliceable result set for an FTS5 MATCH expression.
+    Only the requested page of ids is read from the index, ordered by bm25 rank,
+    and the matching posts are then loaded in a single query.
+    """
+
+    def __init__(self, match):
+        self.match = match
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                    [self.match],
+                )
+                self._count = cursor.fetchone()[0]
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self[key:key + 1][0]
+        start = key.start or 0
+        limit = -1 if key.stop is None else max(key.stop - start, 0)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY rank LIMIT %s OFFSET %s",
+                [self.match, limit, start],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        posts = Post.objects.in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """
+    Inverted-index backend built on an SQLite FTS5 virtual table.
+    The table is created by migration 0004 and keyed by rowid = Post.id.
+    """
+
+    def build_match(self, query):
+        # Quote every token so user input can never inject FTS syntax,
+        # and prefix-match each one; tokens are implicitly ANDed.
+        tokens = TOKEN_RE.findall(query)
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    def search(self, query):
+        match = self.build_match(query)
+        if not match:
+            return Post.objects.none()
+        return FTSResults(match)
+
+    def index_post(self, post):
+        tags = " ".join(post.tags.values_list("name", flat=True))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, content, tags) VALUES (%s, %s, %s, %s)",
+                [post.pk, post.title, post.content, tags],
+            )
+
+    def remove_post(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(REBUILD_SQL)
+
+
+REBUILD_SQL = f"""
+INSERT INTO {FTS_TABLE} (rowid, title, content, tags)
+SELECT p.id, p.title, p.content, COALESCE((
+    SELECT GROUP_CONCAT(t.name, ' ')
+    FROM blog_tag t
+    JOIN blog_post_tags pt ON pt.tag_id = t.id
+    WHERE pt.post_id = p.id
+), '')
+FROM blog_post p
+"""
+
+
+def get_search_backend():
+    """
+    Return the configured backend (settings.BLOG_SEARCH_BACKEND).
+    Databases other than SQLite fall back to the icontains backend.
+    """
+    default = (
+        "blog.search.SQLiteFTSBackend"
+        if connection.vendor == "sqlite"
+        else "blog.search.SimpleSearchBackend"
+    )
+    return import_string(getattr(settings, "BLOG_SEARCH_BACKEND", default))()
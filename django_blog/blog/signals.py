@@ -0,0 +1,108 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import bump_version
+from .counters import comment_added, comment_removed, deletes_posts, recount_after_delete
+from .models import Comment, Post, Tag
+from .search import get_search_backend
+
+
+# Search index maintenance
+
+def _reindex(post_ids):
+    backend = get_search_backend()
+    for post in Post.objects.filter(pk__in=list(post_ids)):
+        backend.index_post(post)
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    get_search_backend().index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    get_search_backend().remove_post(instance.pk)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def reindex_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        # post.tags.add/remove/set/clear: only this post changed
+        if action in ("post_add", "post_remove", "post_clear"):
+            get_search_backend().index_post(instance)
+        return
+    # tag.posts.*: pk_set holds post ids, except on clear where we remember them first
+    if action == "pre_clear":
+        instance._reindex_post_ids = list(instance.posts.values_list("pk", flat=True))
+    elif action in ("post_add", "post_remove", "post_clear"):
+        post_ids = pk_set if pk_set is not None else getattr(instance, "_reindex_post_ids", [])
+        _reindex(post_ids)
+
+
+@receiver(post_save, sender=Tag)
+def reindex_renamed_tag(sender, instance, created, **kwargs):
+    if created:
+        return
+    _reindex(instance.posts.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_tagged_posts(sender, instance, **kwargs):
+    instance._reindex_post_ids = list(instance.posts.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def reindex_deleted_tag(sender, instance, **kwargs):
+    _reindex(getattr(instance, "_reindex_post_ids", []))
+
+
+# Denormalized comment counters on Post (see blog/counters.py)
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    if created:
+        comment_added(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_deleted_comment(sender, instance, origin=None, **kwargs):
+    if origin is None or origin is instance:
+        comment_removed(instance)
+    elif not deletes_posts(origin):
+        # part of a larger delete (a user, a queryset): batch the recount;
+        # a post being deleted needs none
+        recount_after_delete(origin, instance.post_id)
+
+
+# Cache invalidation (see blog/cache.py)
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_posts(sender, **kwargs):
+    bump_version("posts")
+
+
+@receiver(post_save, sender=Comment)
+def invalidate_comments(sender, **kwargs):
+    bump_version("comments")
+
+
+@receiver(post_delete, sender=Comment)
+def invalidate_deleted_comments(sender, instance, origin=None, **kwargs):
+    # once per delete, however many comments it cascades to
+    if origin is None or origin is instance:
+        bump_version("comments")
+    elif not getattr(origin, "_comments_bumped", False):
+        origin._comments_bumped = True
+        bump_version("comments")
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_tags(sender, **kwargs):
+    bump_version("tags")
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_post_tags(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_version("tags")
@@ -0,0 +1,80 @@
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils.text import slugify
+
+from .models import Tag, unique_tag_slug
+
+TAG_NAME_LENGTH = Tag._meta.get_field("name").max_length
+
+
+def parse_tag_names(text):
+    """
+    Split a comma-separated string into normalised tag names:
+    whitespace collapsed, lower-cased, truncated to the column length,
+    empties and duplicates dropped (first occurrence wins the order).
+    """
+    names = []
+    for raw in (text or "").split(","):
+        name = " ".join(raw.split()).lower()[:TAG_NAME_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def tags_named(names):
+    """
+    {lower-cased name: Tag} for tags whose name matches one of `names`
+    ignoring case, so tags created before names were normalised ("Django")
+    are reused. Served by the LOWER(name) index; the oldest tag wins when
+    several differ only in case.
+    """
+    tags = {}
+    for tag in Tag.objects.annotate(name_lower=Lower("name")).filter(name_lower__in=names).order_by("pk"):
+        tags.setdefault(tag.name_lower, tag)
+    return tags
+
+
+def resolve_tags(names):
+    """
+    Return Tag objects for `names` (as returned by parse_tag_names),
+    creating the missing ones. One IN query for existing tags, one bulk INSERT for the rest, and one more
+    IN query to read back their ids. ignore_conflicts makes concurrent writers
+    creating the same tag safe: the loser's insert is skipped and it reads the
+    winner's row. A name whose slug collides with another tag's is skipped by
+    the bulk insert too and falls back to a suffixed slug.
+    """
+    if not names:
+        return []
+    tags = tags_named(names)
+    missing = [name for name in names if name not in tags]
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(name=name, slug=slugify(name)[:50] or "tag") for name in missing],
+            ignore_conflicts=True,
+        )
+        tags.update(tags_named(missing))
+        for name in missing:
+            if name not in tags:
+                tags[name], _ = Tag.objects.get_or_create(
+                    name=name, defaults={"slug": unique_tag_slug(name)}
+                )
+    return [tags[name] for name in names if name in tags]
+
+
+@transaction.atomic
+def set_post_tags(post, names, current_ids=None):
+    """
+    Make `post` carry exactly the tags in `names`.
+    Only the difference is written; pass `current_ids` when the caller already
+    knows the post's tag ids to save the lookup. add()/remove() still send
+    m2m_changed so the search index and caches stay current.
+    """
+    if current_ids is None:
+        current_ids = set(post.tags.values_list("pk", flat=True))
+    wanted_ids = {tag.pk for tag in resolve_tags(names)}
+    to_remove = set(current_ids) - wanted_ids
+    to_add = wanted_ids - set(current_ids)
+    if to_remove:
+        post.tags.remove(*to_remove)
+    if to_add:
+        post.tags.add(*to_add)
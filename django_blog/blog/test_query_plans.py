@@ -0,0 +1,85 @@
+import re
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Comment, Post, Tag
+
+# "SCAN <table>" reads the whole table, and so does "SCAN <table> USING COVERING
+# INDEX i" (the whole index, without visiting the table). "SCAN t USING INDEX i"
+# walks an index in ORDER BY order and stops at the LIMIT; "SEARCH ..." and FTS
+# virtual-table scans are fine.
+FULL_SCAN_RE = re.compile(r"^SCAN (\w+)(?: USING COVERING INDEX \w+)?$")
+
+
+class QueryPlanTests(TestCase):
+    """
+    Runs EXPLAIN QUERY PLAN on every query issued by the blog's list and
+    detail views and fails on full table scans.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="writer", password="pass")
+        cls.tag = Tag.objects.create(name="django")
+        for i in range(15):
+            post = Post.objects.create(title=f"Django post {i}", content="Body", author=cls.user)
+            post.tags.add(cls.tag)
+            Comment.objects.create(post=post, author=cls.user, content="Nice")
+        cls.post = post
+
+    def setUp(self):
+        cache.clear()
+
+    def full_scans(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            details = [row[-1] for row in cursor.fetchall()]
+        return {match.group(1) for match in map(FULL_SCAN_RE.match, details) if match}
+
+    def assertNoFullScans(self, url_name, *args, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(url_name, args=args), params or {})
+        self.assertEqual(response.status_code, 200)
+        for query in ctx.captured_queries:
+            if not query["sql"].startswith("SELECT"):
+                continue
+            scans = self.full_scans(query["sql"])
+            self.assertFalse(scans, f"full scan of {scans} in: {query['sql']}")
+        return response
+
+    def test_post_list(self):
+        response = self.assertNoFullScans("post_list")
+        self.assertNoFullScans("post_list", params={"cursor": response.context["next_cursor"]})
+
+    def test_post_list_most_discussed(self):
+        response = self.assertNoFullScans("post_list", params={"sort": "discussed"})
+        cursor = response.context["next_cursor"]
+        self.assertNoFullScans("post_list", params={"sort": "discussed", "cursor": cursor})
+        sql = str(Post.objects.order_by("-comment_count", "-published_date", "id")[:11].query)
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("blog_post_discussed_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_post_detail(self):
+        self.assertNoFullScans("post_detail", self.post.pk)
+
+    def test_posts_by_tag(self):
+        response = self.assertNoFullScans("posts_by_tag", self.tag.slug)
+        self.assertNoFullScans("posts_by_tag", self.tag.slug, params={"cursor": response.context["next_cursor"]})
+
+    def test_harness_detects_full_scans(self):
+        self.assertEqual(self.full_scans("SELECT * FROM blog_comment WHERE content = 'x'"), {"blog_comment"})
+        # reads all of blog_comment_post_created_idx
+        self.assertEqual(
+            self.full_scans("SELECT post_id FROM blog_comment WHERE created_at > '2000-01-01'"), {"blog_comment"}
+        )
+
+    def test_post_search(self):
+        self.assertNoFullScans("post_search", params={"q": "django"})
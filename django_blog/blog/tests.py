@@ -1,3 +1,374 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .forms import PostForm
+from .models import Comment, Post, Tag
+from .search import get_search_backend
+
+
+class PostSearchTests(TestCase):
+    """
+    Tests for the FTS-backed post search.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="writer", password="pass")
+        self.django_post = Post.objects.create(
+            title="Django tips", content="Querysets are lazy.", author=self.user
+        )
+        self.other_post = Post.objects.create(
+            title="Cooking", content="Pasta with django sauce, django twice.", author=self.user
+        )
+
+    def test_search_matches_title_and_content(self):
+        """Both posts mention django; prefix matching finds 'djan'"""
+        results = get_search_backend().search("djan")
+        self.assertEqual(results.count(), 2)
+
+    def test_index_follows_updates_and_deletes(self):
+        """Saving and deleting posts keeps the index current"""
+        self.django_post.title = "Flask tips"
+        self.django_post.content = "Nothing else."
+        self.django_post.save()
+        self.assertEqual(get_search_backend().search("flask").count(), 1)
+        self.other_post.delete()
+        self.assertEqual(get_search_backend().search("django").count(), 0)
+
+    def test_index_follows_tags(self):
+        """Tag changes are reflected in the index"""
+        tag = Tag.objects.create(name="orm")
+        self.django_post.tags.add(tag)
+        self.assertEqual(list(get_search_backend().search("orm")[0:10]), [self.django_post])
+        tag.delete()
+        self.assertEqual(get_search_backend().search("orm").count(), 0)
+
+    def test_search_view_is_paginated(self):
+        """The search view returns a page of ranked results"""
+        response = self.client.get(reverse("post_search"), {"q": "django"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["posts"]), 2)
+        self.assertEqual(response.context["paginator"].count, 2)
+
+    def test_search_input_is_escaped(self):
+        """FTS operators in user input are treated as plain text"""
+        response = self.client.get(reverse("post_search"), {"q": 'django" OR NEAR('})
+        self.assertEqual(response.status_code, 200)
+
+
+class PostDetailQueryTests(TestCase):
+    """
+    Query-count regression tests for PostDetailView.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass")
+        self.post = Post.objects.create(title="Title", content="Body", author=self.user)
+        self.post.tags.add(Tag.objects.create(name="django"), Tag.objects.create(name="orm"))
+        self.url = reverse("post_detail", args=[self.post.pk])
+
+    def add_comments(self, count):
+        for i in range(count):
+            commenter = User.objects.create_user(username=f"reader{Comment.objects.count()}")
+            Comment.objects.create(post=self.post, author=commenter, content=f"Comment {i}")
+
+    def count_queries(self):
+        cache.clear()  # measure the uncached path
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_detail_uses_fixed_number_of_queries(self):
+        """Post + author, tags, comments + authors"""
+        self.add_comments(3)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertContains(response, "reader0")
+        self.assertContains(response, "orm")
+
+    def test_query_count_does_not_grow_with_comments(self):
+        """Adding comments must not add queries"""
+        self.add_comments(1)
+        baseline = self.count_queries()
+        self.add_comments(10)
+        self.assertEqual(self.count_queries(), baseline)
+
+
+class PostListPaginationTests(TestCase):
+    """
+    Tests for the cursor-paginated post list.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass")
+        for i in range(25):
+            Post.objects.create(title=f"Post {i}", content="word " * 50, author=self.user)
+
+    def test_excerpt_is_computed_on_save(self):
+        """The excerpt holds the first 20 words of the content"""
+        post = Post.objects.first()
+        self.assertEqual(post.excerpt, "word " * 19 + "word …")
+
+    def test_walk_all_pages_by_cursor(self):
+        """Following next_cursor visits every post exactly once, newest first"""
+        seen = []
+        params = {}
+        while True:
+            response = self.client.get(reverse("post_list"), params)
+            self.assertEqual(response.status_code, 200)
+            seen += [post.pk for post in response.context["posts"]]
+            cursor = response.context["next_cursor"]
+            if not cursor:
+                break
+            params = {"cursor": cursor}
+        expected = list(Post.objects.order_by("-published_date", "id").values_list("pk", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_most_discussed_order(self):
+        """?sort=discussed walks posts by comment count, newest first among equals"""
+        for post, count in zip(Post.objects.order_by("pk"), [2, 0, 5, 2]):
+            Post.objects.filter(pk=post.pk).update(comment_count=count)
+        expected = list(
+            Post.objects.order_by("-comment_count", "-published_date", "id").values_list("pk", flat=True)
+        )
+        seen, cursor = [], None
+        while True:
+            params = {"sort": "discussed", **({"cursor": cursor} if cursor else {})}
+            response = self.client.get(reverse("post_list"), params)
+            seen.extend(post.pk for post in response.context["posts"])
+            cursor = response.context["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, expected)
+
+    def test_list_defers_content(self):
+        """A page is one posts query (plus the tag cloud) and never selects the post body"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("post_list"))
+        self.assertEqual(len(ctx.captured_queries), 2)
+        for query in ctx.captured_queries:
+            self.assertNotIn('"blog_post"."content"', query["sql"])
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get(reverse("post_list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+
+class BlogCacheTests(TestCase):
+    """
+    Tests for the page and fragment cache layer.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass")
+        self.post = Post.objects.create(title="Title", content="Body", author=self.user)
+        self.url = reverse("post_detail", args=[self.post.pk])
+
+    def test_anonymous_hot_page_skips_database(self):
+        """A cached page is served without any query"""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, "Title")
+
+    def test_comment_invalidates_detail_page(self):
+        """Writing a comment bumps the version, so the page is rebuilt"""
+        self.client.get(self.url)
+        Comment.objects.create(post=self.post, author=self.user, content="Fresh comment")
+        self.assertContains(self.client.get(self.url), "Fresh comment")
+
+    def test_post_update_invalidates_list_page(self):
+        self.client.get(reverse("post_list"))
+        self.post.title = "Renamed"
+        self.post.save()
+        self.assertContains(self.client.get(reverse("post_list")), "Renamed")
+
+    def test_authenticated_pages_are_not_page_cached(self):
+        """Logged-in users get fresh pages; only fragments are shared"""
+        self.client.force_login(self.user)
+        self.client.get(self.url)
+        Post.objects.filter(pk=self.post.pk).update(title="Changed without signals")
+        response = self.client.get(self.url)
+        self.assertContains(response, "Changed without signals")
+
+
+class PostFormTagTests(TestCase):
+    """
+    Tests for bulk tag resolution in PostForm.save.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass")
+
+    def save_form(self, tags, instance=None):
+        form = PostForm(
+            data={"title": "Title", "content": "Body", "tags": tags},
+            instance=instance or Post(author=self.user),
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        return form.save()
+
+    def count_save_queries(self, tags):
+        with CaptureQueriesContext(connection) as ctx:
+            self.save_form(tags)
+        return len(ctx.captured_queries)
+
+    def test_names_are_normalised_and_deduplicated(self):
+        post = self.save_form(" Django ,django,  Class   Based Views,,")
+        self.assertEqual(
+            sorted(post.tags.values_list("name", flat=True)),
+            ["class based views", "django"],
+        )
+
+    def test_query_count_is_constant_in_number_of_tags(self):
+        """5 new tags and 30 new tags cost the same number of queries"""
+        few = self.count_save_queries(", ".join(f"few{i}" for i in range(5)))
+        many = self.count_save_queries(", ".join(f"many{i}" for i in range(30)))
+        self.assertEqual(few, many)
+
+    def test_existing_tags_are_reused(self):
+        existing = Tag.objects.create(name="django")
+        post = self.save_form("django, orm")
+        self.assertIn(existing, post.tags.all())
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_existing_tags_are_matched_ignoring_case(self):
+        existing = Tag.objects.create(name="Django")
+        post = self.save_form("django, ORM")
+        self.assertIn(existing, post.tags.all())
+        self.assertEqual(sorted(Tag.objects.values_list("name", flat=True)), ["Django", "orm"])
+
+    def test_edit_applies_only_the_difference(self):
+        post = self.save_form("a, b, c")
+        form = PostForm(instance=post)
+        self.assertEqual(form.fields["tags"].initial, "a, b, c")
+        post = self.save_form("b, c, d", instance=post)
+        self.assertEqual(sorted(post.tags.values_list("name", flat=True)), ["b", "c", "d"])
+
+
+class CommentCounterTests(TestCase):
+    """
+    Tests for the denormalized comment_count / last_comment_at columns.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass")
+        self.post = Post.objects.create(title="Title", content="Body", author=self.user)
+        self.client.force_login(self.user)
+
+    def test_create_and_delete_views_maintain_counters(self):
+        self.client.post(reverse("comment_create", args=[self.post.pk]), {"content": "First"})
+        self.client.post(reverse("comment_create", args=[self.post.pk]), {"content": "Second"})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 2)
+        second = Comment.objects.get(content="Second")
+        self.assertEqual(self.post.last_comment_at, second.created_at)
+
+        self.client.post(reverse("comment_delete", args=[second.pk]))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+        self.assertEqual(self.post.last_comment_at, Comment.objects.get().created_at)
+
+    def test_saving_a_stale_post_keeps_counters(self):
+        """A post loaded before a comment was added must not overwrite the count"""
+        stale = Post.objects.get(pk=self.post.pk)
+        Comment.objects.create(post=self.post, author=self.user, content="New")
+        stale.title = "Edited"
+        stale.save()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+        self.assertEqual(self.post.title, "Edited")
+
+    def counter_updates(self, ctx):
+        return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "blog_post"')]
+
+    def test_deleting_a_post_skips_its_counters(self):
+        for i in range(5):
+            Comment.objects.create(post=self.post, author=self.user, content=f"Comment {i}")
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            self.post.delete()
+        self.assertEqual(self.counter_updates(ctx), [])
+
+    def test_cascade_recounts_each_post_once(self):
+        commenter = User.objects.create_user(username="commenter", password="pass")
+        for i in range(5):
+            Comment.objects.create(post=self.post, author=commenter, content=f"Comment {i}")
+        Comment.objects.create(post=self.post, author=self.user, content="Stays")
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            commenter.delete()
+        self.assertEqual(len(self.counter_updates(ctx)), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+
+    def test_explicit_pk_save_inserts(self):
+        Post(pk=self.post.pk + 1, title="Explicit", content="Body", author=self.user).save()
+        self.assertTrue(Post.objects.filter(title="Explicit").exists())
+
+    def test_rebuild_command(self):
+        Comment.objects.create(post=self.post, author=self.user, content="One")
+        Comment.objects.create(post=self.post, author=self.user, content="Two")
+        Post.objects.update(comment_count=0, last_comment_at=None)
+        call_command("rebuild_comment_counts", stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 2)
+        self.assertIsNotNone(self.post.last_comment_at)
+
+
+class TagPageTests(TestCase):
+    """
+    Tests for tag slugs and the cursor-paginated tag page.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass")
+        self.tag = Tag.objects.create(name="class based views")
+        for i in range(12):
+            post = Post.objects.create(title=f"Post {i}", content="Body", author=self.user)
+            post.tags.add(self.tag)
+        self.url = reverse("posts_by_tag", args=[self.tag.slug])
+
+    def test_slug_is_generated_and_unique(self):
+        self.assertEqual(self.tag.slug, "class-based-views")
+        clash = Tag.objects.create(name="class-based views")
+        self.assertEqual(clash.slug, "class-based-views-2")
+
+    def test_bulk_resolved_tags_get_unique_slugs(self):
+        post = PostForm(
+            data={"title": "T", "content": "B", "tags": "c++, c#"},
+            instance=Post(author=self.user),
+        )
+        self.assertTrue(post.is_valid())
+        post = post.save()
+        self.assertEqual(sorted(post.tags.values_list("slug", flat=True)), ["c", "c-2"])
+
+    def test_tag_page_is_one_query_and_paginated(self):
+        """Posts and the tag name come from one query; the cursor reaches the rest"""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Posts tagged with "class based views"')
+        self.assertEqual(len(response.context["posts"]), 10)
+        response = self.client.get(self.url, {"cursor": response.context["next_cursor"]})
+        self.assertEqual(len(response.context["posts"]), 2)
+        self.assertIsNone(response.context["next_cursor"])
+
+    def test_tag_without_posts_still_renders(self):
+        Tag.objects.create(name="empty")
+        response = self.client.get(reverse("posts_by_tag", args=["empty"]))
+        self.assertContains(response, 'Posts tagged with "empty"')
 
-# Create your tests here.
+    def test_unknown_tag_is_404(self):
+        response = self.client.get(reverse("posts_by_tag", args=["missing"]))
+        self.assertEqual(response.status_code, 404)
@@ -24,10 +24,10 @@ urlpatterns = [
     path("post/<int:pk>/", PostDetailView.as_view(), name="post_detail"),
     path("post/<int:pk>/update/", PostUpdateView.as_view(), name="post_update"),
     path("post/<int:pk>/delete/", PostDeleteView.as_view(), name="post_delete"),
-    path("post/<int:pk>/comments/new/", CommentCreateView.as_view(), name="comment_create"),
+    path("post/<int:post_id>/comments/new/", CommentCreateView.as_view(), name="comment_create"),
     path("comment/<int:pk>/update/", CommentUpdateView.as_view(), name="comment_update"),
     path("comment/<int:pk>/delete/", CommentDeleteView.as_view(), name="comment_delete"),
-    # view posts by tag name
+    # view posts by tag slug
     path("tags/<slug:tag_slug>/", PostByTagListView.as_view(), name="posts_by_tag"),
     # search endpoint (query param 'q')
     path("search/", PostSearchListView.as_view(), name="post_search"),
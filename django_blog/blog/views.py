@@ -1,4 +1,5 @@
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, F
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.shortcuts import render, redirect
@@ -13,7 +14,9 @@ from django.urls import reverse_lazy
 from .models import Post, Comment, Tag
 from .forms import PostForm
 from .forms import CommentForm
-from taggit.models import Tag
+from .cache import CachedPageMixin
+from .pagination import KeysetPaginationMixin
+from .search import get_search_backend
 
 def register_view(request):
     """Handle user registration"""
@@ -39,16 +42,49 @@ def profile_view(request):
     return render(request, 'blog/profile.html', {'user': request.user})
 
 
-class PostListView(ListView):
+class PostListView(CachedPageMixin, KeysetPaginationMixin, ListView):
+    """
+    Newest posts first (or most discussed with ?sort=discussed), paginated by cursor.
+    The post body is deferred; the template shows the stored excerpt instead.
+    """
     model = Post
     template_name = "blog/post_list.html"
     context_object_name = "posts"
-    ordering = ["-published_date"]
+    cache_scopes = ("posts", "comments", "tags")
+    orderings = {
+        "newest": ("-published_date", "id"),
+        # served by blog_post_discussed_idx
+        "discussed": ("-comment_count", "-published_date", "id"),
+    }
+
+    def get_queryset(self):
+        return Post.objects.defer("content")
 
-class PostDetailView(DetailView):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # lazy: only evaluated when the tag cloud fragment is not cached
+        context["tag_cloud"] = Tag.objects.annotate(num_posts=Count("posts")).order_by("-num_posts", "name")[:30]
+        return context
+
+class PostDetailView(CachedPageMixin, DetailView):
+    """
+    Show a post with its tags and comments.
+    Tags and comments (with their authors) are each one query, so the page costs
+    the same number of queries however many comments it has. Both querysets
+    stay lazy so a cached fragment skips them entirely.
+    """
     model = Post
     template_name = "blog/post_detail.html"
 
+    def get_queryset(self):
+        return Post.objects.select_related("author")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["tags"] = self.object.tags.all()
+        context["comments"] = self.object.comments.select_related("author").order_by("created_at")
+        return context
+
 class PostCreateView(LoginRequiredMixin, CreateView):
     model = Post
     form_class = PostForm
@@ -96,11 +132,13 @@ class CommentListView(ListView):
 class CommentCreateView(LoginRequiredMixin, CreateView):
     """
     Create a comment for a given post. Requires login.
+    The Comment signals bump the post's counters inside the same transaction.
     """
     model = Comment
     form_class = CommentForm
     template_name = "blog/comment_form.html"
 
+    @transaction.atomic
     def form_valid(self, form):
         post_id = self.kwargs.get('post_id')
         post = get_object_or_404(Post, pk=post_id)
@@ -133,10 +171,15 @@ class CommentUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
 class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
     """
     Delete a comment. Only the comment author may delete.
+    The Comment signals decrement the post's counters inside the same transaction.
     """
     model = Comment
     template_name = "blog/comment_confirm_delete.html"
 
+    @transaction.atomic
+    def form_valid(self, form):
+        return super().form_valid(form)
+
     def get_success_url(self):
         return reverse('post_detail', args=[self.object.post.pk])
 
@@ -145,20 +188,32 @@ class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return self.request.user == comment.author
 
 # Posts by Tag
-class PostByTagListView(ListView):
+class PostByTagListView(CachedPageMixin, KeysetPaginationMixin, ListView):
+    """
+    Posts carrying one tag, newest first, paginated by cursor.
+    A page is one query: posts joined through the (tag, post) index of the
+    PostTag table to the tag's unique slug, with the tag name annotated on each
+    row. Only an empty page looks the tag up on its own (or 404s).
+    """
     model = Post
     template_name = "blog/posts_by_tag.html"  # template for tag listing
     context_object_name = "posts"
-    paginate_by = 5  # optional pagination
+    cache_scopes = ("posts", "comments", "tags")
 
     def get_queryset(self):
-        tag_slug = self.kwargs.get("tag_slug")
-        self.tag = get_object_or_404(Tag, slug=tag_slug)
-        return Post.objects.filter(tags__slug=tag_slug)
+        return (
+            Post.objects.filter(tags__slug=self.kwargs.get("tag_slug"))
+            .annotate(tag_pk=F("tags__pk"), tag_name=F("tags__name"))
+            .defer("content")
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["tag"] = self.tag
+        posts = context["posts"]
+        if posts:
+            context["tag"] = Tag(pk=posts[0].tag_pk, name=posts[0].tag_name, slug=self.kwargs.get("tag_slug"))
+        else:
+            context["tag"] = get_object_or_404(Tag, slug=self.kwargs.get("tag_slug"))
         return context
 
 
@@ -167,23 +222,21 @@ class PostSearchListView(ListView):
     """
     Search posts by title, content, or tag name using query parameter 'q'.
     Example: /search/?q=django
+    Results come from the configured search backend (see blog/search.py),
+    ranked by relevance and paginated.
     """
     model = Post
-    template_name = "blog/search_results.html"
+    template_name = "blog/post_search.html"
     context_object_name = "posts"
+    paginate_by = 10
 
     def get_queryset(self):
         query = self.request.GET.get("q", "").strip()
         if not query:
             return Post.objects.none()
-        # search in title OR content OR tag name
-        return Post.objects.filter(
-            Q(title__icontains=query) |
-            Q(content__icontains=query) |
-            Q(tags__name__icontains=query)
-        ).distinct().order_by("-published_date")
+        return get_search_backend().search(query)
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx['query'] = self.request.GET.get("q", "")
-        return ctx
\ No newline at end of file
+        return ctx